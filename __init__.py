@@ -1,3 +1,26 @@
 __all__ = []
 
-from .detect_script import DetectScripts
+# The functions below are imported from detect_script on first access, so
+# that importing the package does not import re or build any table. See
+# benchmark.BenchImport() for the import time budget.
+_EXPORTS = {
+    'CacheStats', 'ConfigureAsync', 'ConfigureCache',
+    'ConfigureInstrumentation', 'ConfigureScriptTable', 'CountScripts',
+    'DetectScriptSet', 'DetectScripts', 'DetectScriptsAsync',
+    'DetectScriptsAsyncMany', 'DetectScriptsMany', 'DetectScriptsStream',
+    'DominantScript', 'FindIPASpans', 'FirstForeignScript', 'HasScript',
+    'Instrumented', 'InstrumentationStats', 'IterScriptRuns', 'OnlyScripts',
+    'ScriptRatios', 'ScriptSet', 'TenantTables',
+}
+
+def __getattr__(name):
+  if name not in _EXPORTS:
+    raise AttributeError(
+        f'module {__name__!r} has no attribute {name!r}')
+  from . import detect_script
+  value = getattr(detect_script, name)
+  globals()[name] = value
+  return value
+
+def __dir__():
+  return sorted(set(globals()) | _EXPORTS)
@@ -0,0 +1,593 @@
+"""Benchmarks for unicode_scripts
+
+Runs a suite of benchmarks on generated corpora, pyperf style: each
+benchmark is calibrated, warmed up and timed over several runs.
+
+  python -m unicode_scripts.benchmark -o before.json
+  ... change the code ...
+  python -m unicode_scripts.benchmark -o after.json
+  python -m unicode_scripts.benchmark --compare before.json after.json
+
+--speedups instead compares optimized code paths with the code they
+replaced.
+"""
+
+import argparse
+import array
+import asyncio
+import datetime
+import functools
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+
+from .data import (
+    Script, URange, DATA, EXTENSIONS, RANGE_DICT, SCRIPT_TABLE)
+from .detect_script import (
+    ConfigureAsync, DetectScript, DetectScripts, DetectScriptsAsync,
+    DetectScriptSet, FindAndRemoveIPA, Instrumented, IPA_REGEX,
+    _DetectScriptsOfChars)
+from .ranges import Range, RangeDict
+from .script_set import ScriptSet
+from .table import BLOCK_SHIFT, BLOCK_MASK
+
+def MakeCorpus(scripts, length, seed=0):
+  """Generates a reproducible random string of characters from scripts
+
+  Words of 2 to 10 characters are separated by spaces. Each character
+  picks a script, then a code point of it, so scripts are equally
+  frequent however many ranges they have.
+  """
+
+  rng = random.Random(seed)
+  ranges = [DATA[s] for s in scripts]
+  weights = [[r.end() - r.start() + 1 for r in rs] for rs in ranges]
+  chars = []
+  while len(chars) < length:
+    for _ in range(rng.randint(2, 10)):
+      i = rng.randrange(len(scripts))
+      (r,) = rng.choices(ranges[i], weights[i])
+      chars.append(chr(rng.randint(r.start(), r.end())))
+    chars.append(' ')
+  return ''.join(chars[:length])
+
+# Letters of broad English transcriptions.
+_IPA_LETTERS = 'abdefhijklmnoprstuvwzæðŋɑɒɔəɛɜɪʃʊʌʒθˈː'
+
+def MakeIPACorpus(length, seed=0):
+  """Generates a reproducible string of words and their transcriptions
+
+  Example: 'kat /kæt/ dog [dɒɡ] '
+  """
+
+  rng = random.Random(seed)
+  parts = []
+  total = 0
+  while total < length:
+    word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz')
+                   for _ in range(rng.randint(2, 10)))
+    ipa = ''.join(rng.choice(_IPA_LETTERS) for _ in range(len(word)))
+    part = f'{word} /{ipa}/ ' if rng.random() < 0.8 else f'{word} [{ipa}] '
+    parts.append(part)
+    total += len(part)
+  return ''.join(parts)[:length]
+
+def _Latin1Text(length, seed=0, non_ascii=0):
+  """Generates words of ASCII letters, with a share of Latin-1 letters"""
+
+  rng = random.Random(seed)
+  chars = []
+  while len(chars) < length:
+    for _ in range(rng.randint(2, 10)):
+      if rng.random() < non_ascii:
+        chars.append(chr(rng.randint(0xC0, 0xFF)))
+      else:
+        chars.append(rng.choice('abcdefghijklmnopqrstuvwxyzABCDEFGHIJ'))
+    chars.append(rng.choice('  ,.'))
+  return ''.join(chars[:length])
+
+# Functions of (length, seed=0) generating each corpus. ascii and latin-1
+# take the ASCII/Latin-1 fast path of DetectScripts().
+CORPORA = {
+    'ascii': _Latin1Text,
+    'latin-1': functools.partial(_Latin1Text, non_ascii=0.05),
+    'latin': functools.partial(MakeCorpus, [Script.Latn]),
+    'cyrillic': functools.partial(MakeCorpus, [Script.Cyrl, Script.Latn]),
+    'cjk': functools.partial(
+        MakeCorpus, [Script.Hani, Script.Hrkt, Script.Hang, Script.Latn]),
+    'mixed': functools.partial(MakeCorpus, list(DATA)),
+    'ipa': MakeIPACorpus,
+}
+
+def _Time(func, repeat=5, number=1):
+  """Returns the best time in seconds of func() out of repeat runs"""
+
+  return min(timeit.repeat(func, repeat=repeat, number=number))
+
+def _LookupRangeDict(string):
+  for char in string:
+    try:
+      RANGE_DICT[ord(char)]
+    except KeyError:
+      pass
+
+def _LookupScriptTable(string):
+  stage1 = SCRIPT_TABLE.stage1
+  blocks = SCRIPT_TABLE.blocks
+  values = SCRIPT_TABLE.values
+  for char in string:
+    n = ord(char)
+    values[blocks[stage1[n >> BLOCK_SHIFT]][n & BLOCK_MASK]]
+
+def BenchLookup():
+  """Compares per-character RangeDict and ScriptTable lookups"""
+
+  for name, make_corpus in CORPORA.items():
+    corpus = make_corpus(10000)
+    t_range_dict = _Time(lambda: _LookupRangeDict(corpus))
+    t_table = _Time(lambda: _LookupScriptTable(corpus))
+    print(f'lookup {name:>16}: RangeDict {t_range_dict * 1e3:8.3f} ms, '
+          f'ScriptTable {t_table * 1e3:8.3f} ms, '
+          f'speedup {t_range_dict / t_table:5.1f}x')
+
+def BenchRangeDict():
+  """Times RangeDict construction from DATA and memory of RANGE_DICT"""
+
+  items = list(RANGE_DICT.items())
+  t_build = _Time(lambda: RangeDict(items), number=10) / 10
+  tracemalloc.start()
+  range_dict = RangeDict((URange(r.start(), r.end()), v) for (r, v) in items)
+  size = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  del range_dict
+  print(f'RangeDict: {len(items)} ranges, built in {t_build * 1e3:.3f} ms, '
+        f'{size / 1024:.1f} KiB')
+  # RANGE_DICT before coalesced(), as data.py builds it.
+  uncoalesced = RangeDict((r, s) for s in DATA for r in DATA[s]).merged(
+      RangeDict((r, s) for s in EXTENSIONS for r in EXTENSIONS[s]))
+  print(f'RangeDict: coalesced() removed '
+        f'{len(uncoalesced) - len(uncoalesced.coalesced())} of '
+        f'{len(uncoalesced)} ranges')
+
+def BenchRangeDictMutation(count=50000):
+  """Times building a large RangeDict by construction and by insertion"""
+
+  items = [(Range(2 * i, 2 * i), i) for i in range(count)]
+  shuffled = items[:]
+  random.Random(0).shuffle(shuffled)
+  def insert_all():
+    range_dict = RangeDict([])
+    for (r, v) in shuffled:
+      range_dict[r] = v
+    return range_dict
+  assert(insert_all() == RangeDict.from_sorted(items))
+  t_init = _Time(lambda: RangeDict(shuffled))
+  t_sorted = _Time(lambda: RangeDict.from_sorted(items))
+  t_insert = _Time(insert_all)
+  print(f'RangeDict {count} ranges: RangeDict() {t_init * 1e3:8.3f} ms, '
+        f'from_sorted() {t_sorted * 1e3:8.3f} ms, '
+        f'random inserts {t_insert * 1e3:8.3f} ms')
+
+def _GetEach(range_dict, numbers):
+  results = []
+  for n in numbers:
+    try:
+      results.append(range_dict[n])
+    except KeyError:
+      results.append(None)
+  return results
+
+def BenchGetMany():
+  """Compares RangeDict.getmany with one lookup per code point"""
+
+  for name, make_corpus in CORPORA.items():
+    numbers = array.array('I', map(ord, make_corpus(10000)))
+    assert(RANGE_DICT.getmany(numbers) == _GetEach(RANGE_DICT, numbers))
+    t_each = _Time(lambda: _GetEach(RANGE_DICT, numbers))
+    t_many = _Time(lambda: RANGE_DICT.getmany(numbers))
+    print(f'getmany {name:>16}: __getitem__ {t_each * 1e3:8.3f} ms, '
+          f'getmany {t_many * 1e3:8.3f} ms, '
+          f'speedup {t_each / t_many:5.1f}x')
+
+def _DetectScriptsPerChar(string):
+  # DetectScripts as it was before the distinct-character fast path.
+  no_ipa_string = FindAndRemoveIPA(string)
+  scripts = {DetectScript(char) for char in no_ipa_string}
+  scripts.discard(None)
+  if len(no_ipa_string) < len(string):
+    scripts.add(Script.IPA)
+  return scripts
+
+def BenchDetectScripts():
+  """Compares DetectScripts with a per-character loop on long inputs"""
+
+  for name, make_corpus in CORPORA.items():
+    corpus = make_corpus(20000)
+    assert(DetectScripts(corpus) == _DetectScriptsPerChar(corpus))
+    t_per_char = _Time(lambda: _DetectScriptsPerChar(corpus))
+    t_fast = _Time(lambda: DetectScripts(corpus))
+    print(f'DetectScripts {name:>16}: per-char {t_per_char * 1e3:8.3f} ms, '
+          f'DetectScripts {t_fast * 1e3:8.3f} ms, '
+          f'speedup {t_per_char / t_fast:5.1f}x')
+
+def BenchLatin1(count=200):
+  """Compares DetectScripts with and without the Latin-1 fast path
+
+  Covers short and long ASCII and Latin-1 posts without IPA delimiters.
+  """
+
+  for (name, non_ascii) in (('ascii', 0), ('latin-1', 0.05)):
+    for length in (100, 10000):
+      posts = [_Latin1Text(length, seed, non_ascii) for seed in range(count)]
+      assert(all(DetectScripts(post) == _DetectScriptsOfChars(post)
+                 for post in posts))
+      t_general = _Time(lambda: [_DetectScriptsOfChars(p) for p in posts])
+      t_fast = _Time(lambda: [DetectScripts(p) for p in posts])
+      print(f'Latin-1 fast path {name:>7} {length:5} chars: '
+            f'general {t_general / count * 1e6:8.3f} us, '
+            f'fast path {t_fast / count * 1e6:8.3f} us, '
+            f'speedup {t_general / t_fast:5.1f}x')
+
+def BenchScriptSet(count=2000):
+  """Compares aggregating DetectScripts and DetectScriptSet results"""
+
+  corpus = MakeCorpus(list(DATA), count * 50)
+  posts = [corpus[i:i + 50] for i in range(0, len(corpus), 50)]
+  def aggregate_sets():
+    total = set()
+    for post in posts:
+      total |= DetectScripts(post)
+    return total
+  def aggregate_masks():
+    total = ScriptSet()
+    for post in posts:
+      total |= DetectScriptSet(post)
+    return total
+  assert(aggregate_masks() == aggregate_sets())
+  t_sets = _Time(aggregate_sets)
+  t_masks = _Time(aggregate_masks)
+  print(f'aggregate {count} posts: DetectScripts {t_sets * 1e3:8.3f} ms, '
+        f'DetectScriptSet {t_masks * 1e3:8.3f} ms, '
+        f'speedup {t_sets / t_masks:5.1f}x')
+
+def BenchIPA():
+  """Compares FindAndRemoveIPA with the uncompiled IPA regex
+
+  Covers strings without any IPA delimiter, which skip the regex, and
+  strings with transcriptions.
+  """
+
+  plain = MakeCorpus([Script.Latn], 2000)
+  with_ipa = ' '.join(f'{word} /{word}/' for word in plain.split())
+  for (name, string) in (('no delimiters', plain), ('with IPA', with_ipa)):
+    assert(FindAndRemoveIPA(string) == re.sub(IPA_REGEX, '', string))
+    # Purge the re module cache so that re.sub() pays for compiling the
+    # pattern as it does when other patterns have evicted it.
+    t_re = _Time(lambda: (re.purge(), re.sub(IPA_REGEX, '', string)),
+                 number=100)
+    t_fast = _Time(lambda: FindAndRemoveIPA(string), number=100)
+    print(f'FindAndRemoveIPA {name:>13}: re.sub {t_re * 1e4:8.3f} us, '
+          f'FindAndRemoveIPA {t_fast * 1e4:8.3f} us, '
+          f'speedup {t_re / t_fast:5.1f}x')
+
+def BenchInstrumentation(count=1000):
+  """Compares DetectScripts with instrumentation disabled and enabled"""
+
+  for (name, make_corpus) in CORPORA.items():
+    corpus = make_corpus(count * 100)
+    posts = [corpus[i:i + 100] for i in range(0, len(corpus), 100)]
+    detect_all = lambda: [DetectScripts(post) for post in posts]
+    t_disabled = _Time(detect_all)
+    with Instrumented():
+      t_enabled = _Time(detect_all)
+    print(f'instrumentation {name:>8}: disabled '
+          f'{t_disabled / count * 1e6:8.3f} us, enabled '
+          f'{t_enabled / count * 1e6:8.3f} us per 100 chars, overhead '
+          f'{t_enabled / t_disabled - 1:6.1%}')
+
+def _ThreadsThroughput(func, posts, threads, rounds):
+  """Returns posts per second of threads calling func on every post"""
+
+  barrier = threading.Barrier(threads + 1)
+  def work():
+    barrier.wait()
+    for _ in range(rounds):
+      for post in posts:
+        func(post)
+  workers = [threading.Thread(target=work) for _ in range(threads)]
+  for worker in workers:
+    worker.start()
+  barrier.wait()
+  start = time.perf_counter()
+  for worker in workers:
+    worker.join()
+  return threads * rounds * len(posts) / (time.perf_counter() - start)
+
+def BenchThreads(count=2000, rounds=3):
+  """Measures DetectScripts throughput with several threads
+
+  Threads share SCRIPT_TABLE and the immutable lookup caches without
+  locks, so throughput scales with the number of cores on a free-threaded
+  build. With the GIL, it stays flat.
+  """
+
+  corpus = MakeCorpus(list(DATA), count * 200)
+  posts = [corpus[i:i + 200] for i in range(0, len(corpus), 200)]
+  DetectScripts(posts[0])
+  gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+  cpus = os.cpu_count() or 1
+  baseline = None
+  for threads in sorted({1, 2, 4, cpus}):
+    throughput = _ThreadsThroughput(DetectScripts, posts, threads, rounds)
+    baseline = baseline or throughput
+    print(f'DetectScripts {threads:2} threads: {throughput:10.0f} posts/s, '
+          f'{throughput / baseline:5.2f}x ({cpus} CPUs, '
+          f'GIL {"enabled" if gil else "disabled"})')
+
+async def _LoopLatencies(coroutine, interval=0.001):
+  """Runs coroutine while measuring how late the event loop wakes up
+
+  Returns the delays in seconds of sleeps of interval seconds.
+  """
+
+  delays = []
+  done = asyncio.Event()
+  async def tick():
+    while not done.is_set():
+      start = time.perf_counter()
+      await asyncio.sleep(interval)
+      delays.append(time.perf_counter() - start - interval)
+  ticker = asyncio.ensure_future(tick())
+  await asyncio.sleep(interval)
+  await coroutine
+  done.set()
+  await ticker
+  return delays
+
+def BenchAsync(length=2000000, count=5):
+  """Compares event loop latency with DetectScriptsAsync off and on
+
+  The event loop sleeps in a loop while count long strings are detected.
+  A threshold above the string length detects them on the loop.
+  """
+
+  corpus = MakeCorpus(list(DATA), length)
+  async def detect_all():
+    for _ in range(count):
+      await DetectScriptsAsync(corpus)
+  for (name, threshold) in (('inline', length + 1), ('executor', 1 << 14)):
+    ConfigureAsync(threshold)
+    delays = sorted(asyncio.run(_LoopLatencies(detect_all())))
+    p99 = delays[int(len(delays) * 0.99)]
+    print(f'DetectScriptsAsync {name:>8}: loop delay p99 {p99 * 1e3:8.3f} ms, '
+          f'max {delays[-1] * 1e3:8.3f} ms')
+  ConfigureAsync(1 << 14)
+
+# Budget for the import time of the package, in microseconds, as the
+# cumulative time -X importtime reports for the package. It includes the
+# modules the package imports first, but not the interpreter startup.
+IMPORT_BUDGET_US = 1000
+
+def _ImportTime(module, path):
+  """Returns the cumulative import time of module in a new interpreter"""
+
+  result = subprocess.run(
+      [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+      cwd=path, capture_output=True, text=True, check=True)
+  for line in result.stderr.splitlines():
+    (_, cumulative, name) = line.split('|')
+    if name.strip() == module:
+      return int(cumulative)
+  raise ValueError(f'No import time reported for {module}.')
+
+def _ImportTimes(runs):
+  """Returns the import times of the package
+
+  Returns one time in microseconds per run, the best of 3 imports in new
+  interpreters.
+  """
+
+  package = __package__
+  package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  return [min(_ImportTime(package, package_path) for _ in range(3))
+          for _ in range(runs)]
+
+def BenchImport(repeat=5):
+  """Checks the import time of the package against IMPORT_BUDGET_US"""
+
+  import_time = statistics.median(_ImportTimes(repeat))
+  print(f'import {__package__}: {import_time} us, '
+        f'budget {IMPORT_BUDGET_US} us: '
+        f'{"OK" if import_time <= IMPORT_BUDGET_US else "OVER BUDGET"}')
+
+def Measure(func, runs=10, warmups=1, min_time=0.02, ops=1):
+  """Times func() as pyperf does
+
+  The number of loops is calibrated so that a run takes at least
+  min_time seconds, then warmups runs are discarded.
+
+  Input:
+    ops: Number of operations per call of func, e.g. characters looked
+      up, to report the time per operation.
+
+  Returns the time per operation in seconds of each run.
+  """
+
+  loops = 1
+  while timeit.timeit(func, number=loops) < min_time:
+    loops *= 2
+  for _ in range(warmups):
+    timeit.timeit(func, number=loops)
+  return [timeit.timeit(func, number=loops) / (loops * ops)
+          for _ in range(runs)]
+
+# Lengths in characters of the posts of DetectScripts benchmarks.
+POST_LENGTHS = {'short': 100, 'medium': 2000, 'long': 100000}
+
+def _LookupEach(string):
+  for char in string:
+    DetectScript(char)
+
+def Suite():
+  """Yields (name, func, ops) for each benchmark, see Measure()"""
+
+  for (name, make_corpus) in CORPORA.items():
+    chars = make_corpus(1000)
+    yield (f'DetectScript/{name}', functools.partial(_LookupEach, chars),
+           len(chars))
+  for (name, make_corpus) in CORPORA.items():
+    for (size, length) in POST_LENGTHS.items():
+      post = make_corpus(length)
+      yield (f'DetectScripts/{name}/{size}',
+             functools.partial(DetectScripts, post), 1)
+  for (name, make_corpus) in CORPORA.items():
+    yield (f'FindAndRemoveIPA/{name}',
+           functools.partial(FindAndRemoveIPA, make_corpus(2000)), 1)
+  items = list(RANGE_DICT.items())
+  yield ('RangeDict/construct', functools.partial(RangeDict, items), 1)
+  for (name, make_corpus) in CORPORA.items():
+    chars = make_corpus(1000)
+    yield (f'RangeDict/lookup/{name}',
+           functools.partial(_LookupRangeDict, chars), len(chars))
+
+def _FormatTime(seconds):
+  for (unit, scale) in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+    if seconds >= scale:
+      return f'{seconds / scale:.3f} {unit}'
+  return f'{seconds / 1e-9:.1f} ns'
+
+def _FormatValues(values, unit):
+  mean = statistics.mean(values)
+  stdev = statistics.stdev(values) if len(values) > 1 else 0
+  if unit == 'us':
+    return f'{mean:.0f} us +- {stdev:.0f} us'
+  return f'{_FormatTime(mean)} +- {_FormatTime(stdev)}'
+
+def RunSuite(runs=10, patterns=None):
+  """Runs the benchmarks whose name contains one of patterns
+
+  Prints each result. Returns a dict mapping benchmark names to
+  {'unit': unit, 'values': values}.
+  """
+
+  def selected(name):
+    return not patterns or any(p in name for p in patterns)
+
+  results = {}
+  for (name, func, ops) in Suite():
+    if selected(name):
+      results[name] = {'unit': 's', 'values': Measure(func, runs, ops=ops)}
+      print(f'{name:<32} {_FormatValues(results[name]["values"], "s")}')
+  if selected('import'):
+    values = _ImportTimes(max(runs // 2, 1))
+    results['import'] = {'unit': 'us', 'values': values}
+    within_budget = statistics.median(values) <= IMPORT_BUDGET_US
+    print(f'{"import":<32} {_FormatValues(values, "us")}, '
+          f'budget {IMPORT_BUDGET_US} us: '
+          f'{"OK" if within_budget else "OVER BUDGET"}')
+  return results
+
+def _Commit():
+  try:
+    return subprocess.run(
+        ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(__file__),
+        capture_output=True, text=True, check=True).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+def SaveResults(results, path):
+  """Writes the results of RunSuite() with metadata to a JSON file"""
+
+  with open(path, 'w') as f:
+    json.dump({
+        'metadata': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _Commit(),
+            'python': sys.version,
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'benchmarks': results,
+    }, f, indent=1)
+
+def CompareResults(old_path, new_path):
+  """Prints the change of each benchmark between two saved results
+
+  A change is significant when the means differ by more than the sum of
+  the standard deviations.
+  """
+
+  with open(old_path) as f:
+    old = json.load(f)
+  with open(new_path) as f:
+    new = json.load(f)
+  print(f'old: {old["metadata"]["commit"]} {old["metadata"]["date"]}')
+  print(f'new: {new["metadata"]["commit"]} {new["metadata"]["date"]}')
+  for name in old['benchmarks']:
+    if name not in new['benchmarks']:
+      continue
+    (a, b) = (old['benchmarks'][name], new['benchmarks'][name])
+    (mean_a, mean_b) = (statistics.mean(a['values']),
+                        statistics.mean(b['values']))
+    noise = sum(statistics.stdev(r['values']) if len(r['values']) > 1 else 0
+                for r in (a, b))
+    change = (f'{mean_b / mean_a:.2f}x slower' if mean_b > mean_a else
+              f'{mean_a / mean_b:.2f}x faster')
+    if abs(mean_b - mean_a) <= noise:
+      change = 'not significant'
+    print(f'{name:<32} {_FormatValues(a["values"], a["unit"])} -> '
+          f'{_FormatValues(b["values"], b["unit"])}: {change}')
+
+def RunSpeedups():
+  """Compares optimized code paths with the code they replaced"""
+
+  BenchImport()
+  BenchLookup()
+  BenchRangeDict()
+  BenchRangeDictMutation()
+  BenchGetMany()
+  BenchDetectScripts()
+  BenchLatin1()
+  BenchScriptSet()
+  BenchIPA()
+  BenchInstrumentation()
+  BenchAsync()
+  BenchThreads()
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+      prog=f'python -m {__package__}.benchmark',
+      description='Benchmarks for unicode_scripts.')
+  parser.add_argument('-o', '--output', help='Path of a JSON file to write '
+                      'the results to')
+  parser.add_argument('-b', '--bench', action='append',
+                      help='Only run benchmarks whose name contains BENCH')
+  parser.add_argument('--runs', type=int, default=10,
+                      help='Number of timed runs per benchmark')
+  parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                      help='Compare two JSON files written with -o')
+  parser.add_argument('--speedups', action='store_true',
+                      help='Compare optimized code paths with the code '
+                      'they replaced')
+  args = parser.parse_args(argv)
+  if args.compare:
+    CompareResults(*args.compare)
+  elif args.speedups:
+    RunSpeedups()
+  else:
+    results = RunSuite(args.runs, args.bench)
+    if args.output:
+      SaveResults(results, args.output)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,106 @@
+import collections
+import sys
+import threading
+
+class LRUCache:
+  """Bounded least-recently-used cache keyed by strings
+
+  Bounded both by number of entries and by the total size in bytes of
+  the keys, as reported by sys.getsizeof(). Safe to use from several
+  threads.
+
+  Example:
+    cache = LRUCache(max_entries=2)
+    cache.get('a', str.upper) -> 'A'  # miss
+    cache.get('a', str.upper) -> 'A'  # hit
+    cache.stats() -> {'hits': 1, 'misses': 1, 'evictions': 0, ...}
+  """
+
+  def __init__(self, max_entries, max_bytes=None):
+    """
+    Input:
+      max_entries: Maximum number of entries, must be positive.
+      max_bytes: Maximum total size of the keys, or None for no limit.
+    """
+
+    if max_entries <= 0:
+      raise ValueError(f'LRUCache: max_entries must be positive, but is '
+                       f'{max_entries}.')
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    self._data = collections.OrderedDict()
+    self._bytes = 0
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def get(self, key, compute):
+    """Returns the cached value of key, or caches compute(key)
+
+    compute() runs outside of the lock, so concurrent misses on the same
+    key may compute it more than once.
+    """
+
+    with self._lock:
+      try:
+        value = self._data[key]
+      except KeyError:
+        self.misses += 1
+      else:
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+    value = compute(key)
+    size = sys.getsizeof(key)
+    if self._max_bytes is not None and size > self._max_bytes:
+      return value
+    with self._lock:
+      if key not in self._data:
+        self._data[key] = value
+        self._bytes += size
+        while (len(self._data) > self._max_entries or
+               (self._max_bytes is not None and
+                self._bytes > self._max_bytes)):
+          (old_key, _) = self._data.popitem(last=False)
+          self._bytes -= sys.getsizeof(old_key)
+          self.evictions += 1
+    return value
+
+  def clear(self):
+    with self._lock:
+      self._data.clear()
+      self._bytes = 0
+
+  def stats(self):
+    """Returns the counters and current size as a dict"""
+
+    with self._lock:
+      return {
+          'hits': self.hits,
+          'misses': self.misses,
+          'evictions': self.evictions,
+          'entries': len(self._data),
+          'bytes': self._bytes,
+      }
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  cache = LRUCache(max_entries=2)
+  assert(cache.get('a', str.upper) == 'A')
+  assert(cache.get('a', str.upper) == 'A')
+  assert(cache.get('b', str.upper) == 'B')
+  assert(cache.get('c', str.upper) == 'C')  # Evicts 'a'.
+  assert(cache.get('b', lambda key: None) == 'B')
+  assert(cache.get('a', lambda key: None) is None)
+  stats = cache.stats()
+  assert(stats['hits'] == 2)
+  assert(stats['misses'] == 4)
+  assert(stats['evictions'] == 2)
+  assert(stats['entries'] == 2)
+  cache = LRUCache(max_entries=10, max_bytes=2 * sys.getsizeof('a'))
+  for key in 'abc':
+    cache.get(key, str.upper)
+  assert(cache.stats()['entries'] == 2)
+  assert(cache.get('x' * 1000, str.upper) == 'X' * 1000)
+  assert(cache.stats()['entries'] == 2)
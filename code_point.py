@@ -1,6 +1,8 @@
 class CodePoint(int):
   """An int that represents a code point and prints as hex"""
 
+  __slots__ = ()
+
   def __new__(cls, arg):
     try:
       arg = ord(arg)
@@ -48,5 +50,7 @@ class CodePointString(str):
 class UnicodeCodePoint(CodePoint):
   """An int that represents a code point and prints as U+0000"""
 
+  __slots__ = ()
+
   def __str__(self):
     return f'U+{self:04X}'
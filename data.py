@@ -1,6 +1,7 @@
 import enum
 
-from .ranges import Range, RangeDict
+from .ranges import FrozenRangeDict, Range, RangeDict
+from .table import ScriptTable
 
 from .code_point import UnicodeCodePoint
 
@@ -169,660 +170,745 @@ class Script(enum.Enum):
   Adlm = 'Adlam'
 
 class URange(Range):
+  __slots__ = ()
+
   def __init__(self, start, end):
     super().__init__(UnicodeCodePoint(start), UnicodeCodePoint(end))
 
-# Comments indicate the official title(s) of the Unicode Block.
-DATA = {
-  Script.Latn: [
-    URange(0x0041, 0x005A),  # Basic Latin
-    URange(0x0061, 0x007A),  # Latin-1 Supplement
-    URange(0x00C0, 0x00D6),  # "
-    URange(0x00D8, 0x00F6),  # "
-    URange(0x00F8, 0x00FF),  # "
-    URange(0x0100, 0x02AF),  # Latin Extended-A + Latin Extended-B +
-                             # IPA Extensions
-    URange(0x1E00, 0x1EFF),  # Latin Extended Additional
-    URange(0x1D00, 0x1D25),  # Phonetic Extensions
-    URange(0x1D6C, 0x1D9A),  # " + Phonetic Extensions Supplement
-    URange(0x2C60, 0x2C7B),  # Latin Extended-C
-    URange(0x2C7E, 0x2C7F),  # "
-    URange(0xA722, 0xA787),  # Latin Extended-D
-    URange(0xA78B, 0xA7D9),  # "
-    URange(0xA7F5, 0xA7F7),  # "
-    URange(0xA7FA, 0xA7FF),  # "
-    URange(0xAB30, 0xAB5A),  # Latin Extended-E
-    URange(0xAB60, 0xAB68),  # "
-    URange(0xFB00, 0xFB06),  # Alphabetic Presentation Forms
-    URange(0x1DF00, 0x1DF1E),  # Latin Extended-G
-  ],
-  Script.Grek: [
-    URange(0x0370, 0x0373),  # Greek and Coptic
-    URange(0x0376, 0x0377),  # "
-    URange(0x037B, 0x037D),  # "
-    URange(0x037F, 0x037F),  # "
-    URange(0x0386, 0x0386),  # "
-    URange(0x0388, 0x03E1),  # "
-    URange(0x03F0, 0x03FF),  # "
-    URange(0x1F00, 0x1FBC),  # Greek Extended
-    URange(0x1FC2, 0x1FCC),  # "
-    URange(0x1FD0, 0x1FDC),  # "
-    URange(0x1FE0, 0x1FEC),  # "
-    URange(0x1FF0, 0x1FFC),  # "
-    URange(0x1D26, 0x1D2A),  # Phonetic Extensions
-  ],
-  Script.Copt: [
-    URange(0x03E2, 0x03EF),  # Greek and Coptic
-    URange(0x2C80, 0x2CEF),  # Coptic
-    URange(0x2CF2, 0x2CF3),  # "
-  ],
-  Script.Cyrl: [
-    URange(0x0400, 0x0481),  # Cyrillic
-    URange(0x048A, 0x052F),  # " + Cyrillic Supplement
-    URange(0x1C80, 0x1C88),  # Cyrillic Extended-C
-    URange(0x1D2B, 0x1D2B),  # Phonetic Extensions
-    URange(0xA640, 0xA66E),  # Cyrillic Extended-B
-    URange(0xA680, 0xA69B),  # "
-  ],
-  Script.Armn: [
-    URange(0x0531, 0x0556),  # Armenian
-    URange(0x0560, 0x0588),  # "
-    URange(0xFB13, 0xFB17),  # Alphabetic Presentation Forms
-  ],
-  Script.Hebr: [
-    URange(0x05D0, 0x05F2),  # Hebrew
-    URange(0xFB1D, 0xFB4F),  # Alphabetic Presentation Forms
-  ],
-  Script.Arab: [
-    URange(0x0620, 0x063F),  # Arabic
-    URange(0x0641, 0x064A),  # "
-    URange(0x066E, 0x066F),  # "
-    URange(0x0671, 0x0673),  # "
-    URange(0x0675, 0x06D3),  # "
-    URange(0x06D5, 0x06D5),  # "
-    URange(0x06EE, 0x06EF),  # "
-    URange(0x06FA, 0x06FF),  # "
-    URange(0x0750, 0x077F),  # Arabic Supplement
-    URange(0x0870, 0x0882),  # Arabic Extended-B
-    URange(0x0886, 0x0886),  # "
-    URange(0x0889, 0x088D),  # "
-    URange(0x08A0, 0x08C8),  # Arabic Extended-A
-    URange(0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
-    URange(0xFE70, 0xFEFC),  # Arabic Presentation Forms-B
-  ],
-  Script.Syrc: [
-    URange(0x0710, 0x0710),  # Syriac
-    URange(0x0712, 0x072F),  # "
-    URange(0x074D, 0x074F),  # "
-    URange(0x0860, 0x086A),  # Syriac Supplement
-  ],
-  Script.Thaa: [
-    URange(0x0780, 0x07A5),  # Thaana
-    URange(0x07B1, 0x07B1),  # "
-  ],
-  Script.Nkoo: [
-    URange(0x07CA, 0x07EA),  # NKo
-  ],
-  Script.Samr: [
-    URange(0x0800, 0x0815),  # Samaritan
-  ],
-  Script.Mand: [
-    URange(0x0840, 0x0858),  # Mandaic
-  ],
-  Script.Deva: [
-    URange(0x0904, 0x0939),  # Devanagari
-    URange(0x0958, 0x0961),  # "
-    URange(0x0972, 0x097F),  # "
-    URange(0xA8FE, 0xA8FE),  # Devanagari Extended
-  ],
-  Script.Beng: [
-    URange(0x0985, 0x09B9),  # Bengali
-    URange(0x09CE, 0x09CE),  # "
-    URange(0x09DC, 0x09E1),  # "
-    URange(0x09F0, 0x09F1),  # "
-    URange(0x09FC, 0x09FC),  # "
-  ],
-  Script.Guru: [
-    URange(0x0A05, 0x0A39),  # Gurmukhi
-    URange(0x0A59, 0x0A5E),  # "
-  ],
-  Script.Gujr: [
-    URange(0x0A85, 0x0AB9),  # Gujarati
-    URange(0x0AE0, 0x0AE1),  # "
-    URange(0x0AF9, 0x0AF9),  # "
-  ],
-  Script.Orya: [
-    URange(0x0B05, 0x0B39),  # Oriya
-    URange(0x0B5C, 0x0B61),  # "
-    URange(0x0B71, 0x0B71),  # "
-  ],
-  Script.Taml: [
-    URange(0x0B85, 0x0BB9),  # Tamil
-  ],
-  Script.Telu: [
-    URange(0x0C05, 0x0C39),  # Telugu
-    URange(0x0C58, 0x0C61),  # "
-  ],
-  Script.Knda: [
-    URange(0x0C85, 0x0CB9),  # Kannada
-    URange(0x0CDD, 0x0CE1),  # "
-  ],
-  Script.Mlym: [
-    URange(0x0D04, 0x0D3A),  # Malayalam
-    URange(0x0D54, 0x0D56),  # "
-    URange(0x0D5F, 0x0D61),  # "
-    URange(0x0D7A, 0x0D7F),  # "
-  ],
-  Script.Sinh: [
-    URange(0x0D85, 0x0DC6),  # Sinhala
-  ],
-  Script.Thai: [
-    URange(0x0E01, 0x0E2E),  # Thai
-  ],
-  Script.Laoo: [
-    URange(0x0E81, 0x0EAE),  # Lao
-    URange(0x0EDE, 0x0EDF),  # "
-  ],
-  Script.Tibt: [
-    URange(0x0F40, 0x0F6C),  # Tibetan
-  ],
-  Script.Mymr: [
-    URange(0x1000, 0x102A),  # Myanmar
-    URange(0x103F, 0x103F),  # "
-    URange(0x104C, 0x1055),  # "
-    URange(0x105A, 0x105D),  # "
-    URange(0x1061, 0x1061),  # "
-    URange(0x1065, 0x1066),  # "
-    URange(0x106E, 0x1070),  # "
-    URange(0x1075, 0x1082),  # "
-    URange(0x108E, 0x108E),  # "
-    URange(0xA9E0, 0xA9E4),  # Myanmar Extended-B
-    URange(0xA9E7, 0xA9EF),  # "
-    URange(0xA9FA, 0xA9FE),  # "
-    URange(0xAA60, 0xAA6F),  # Myanmar Extended-A
-    URange(0xAA74, 0xAA76),  # "
-    URange(0xAA78, 0xAA7A),  # "
-    URange(0xAA7E, 0xAA7F),  # "
-  ],
-  Script.Geor: [
-    URange(0x10A0, 0x10FA),  # Georgian
-    URange(0x10FC, 0x10FF),  # "
-    URange(0x1C90, 0x1CBF),  # Georgian Extended
-    URange(0x2D00, 0x2D2D),  # Georgian Supplement
-  ],
-  Script.Hang: [
-    URange(0x1100, 0x115E),  # Hangul Jamo
-    URange(0x1161, 0x11FF),  # "
-    URange(0x3131, 0x3163),  # Hangul Compatibility Jamo
-    URange(0x3165, 0x318E),  # "
-    URange(0xA960, 0xA97F),  # Hangul Jamo Extended-A
-    URange(0xAC00, 0xD7FF),  # Hangul Syllables +
-                             # Hangul Jamo Extended-B
-    URange(0xFFA1, 0xFFDF),  # Halfwidth and Fullwidth Forms
-  ],
-  Script.Ethi: [
-    URange(0x1200, 0x135A),  # Ethiopic
-    URange(0x1380, 0x138F),  # Ethiopic Supplement
-    URange(0x2D80, 0x2DDF),  # Ethiopic Extended
-    URange(0xAB00, 0xAB2F),  # Ethiopic Extended-A
-    URange(0x1E7E0, 0x1E7FF),  # Ethiopic Extended-B
-  ],
-  Script.Cher: [
-    URange(0x13A0, 0x13FF),  # Cherokee
-    URange(0xAB70, 0xABBF),  # Cherokee Supplement
-  ],
-  Script.Cans: [
-    URange(0x1401, 0x166C),  # Unified Canadian Aboriginal Syllabics
-    URange(0x166F, 0x167F),  # "
-    URange(0x18B0, 0x18F5),  # U.C.A.S. Extended
-    URange(0x11AB0, 0x11ABF),  # U.C.A.S. Extended-A
-  ],
-  Script.Ogam: [
-    URange(0x1681, 0x169A),  # Ogham
-  ],
-  Script.Runr: [
-    URange(0x16A0, 0x16EA),  # Runic
-    URange(0x16F1, 0x16F8),  # "
-  ],
-  Script.Tglg: [
-    URange(0x1700, 0x1711),  # Tagalog
-    URange(0x171F, 0x171F),  # "
-  ],
-  Script.Hano: [
-    URange(0x1720, 0x1731),  # Hanunoo
-  ],
-  Script.Buhd: [
-    URange(0x1740, 0x1751),  # Buhid
-  ],
-  Script.Tagb: [
-    URange(0x1760, 0x1770),  # Tagbanwa
-  ],
-  Script.Khmr: [
-    URange(0x1780, 0x17B3),  # Khmer
-  ],
-  Script.Mong: [
-    URange(0x1820, 0x18AA),  # Mongolian
-  ],
-  Script.Limb: [
-    URange(0x1900, 0x191E),  # Limbu
-  ],
-  Script.Tale: [
-    URange(0x1950, 0x1974),  # Tai Le
-  ],
-  Script.Talu: [
-    URange(0x1980, 0x19C9),  # New Tai Lue
-  ],
-  Script.Bugi: [
-    URange(0x1A00, 0x1A16),  # Buginese
-  ],
-  Script.Lana: [
-    URange(0x1A20, 0x1A54),  # Tai Tham
-    URange(0x1AA0, 0x1AA2),  # "
-  ],
-  Script.Bali: [
-    URange(0x1B05, 0x1B33),  # Balinese
-    URange(0x1B45, 0x1B4C),  # "
-  ],
-  Script.Sund: [
-    URange(0x1B83, 0x1BA0),  # Sundanese
-    URange(0x1BAE, 0x1BAF),  # "
-    URange(0x1BBB, 0x1BBF),  # "
-  ],
-  Script.Batk: [
-    URange(0x1BC0, 0x1BE5),  # Batak
-  ],
-  Script.Lepc: [
-    URange(0x1C00, 0x1C23),  # Lepcha
-    URange(0x1C4D, 0x1C4F),  # "
-  ],
-  Script.Olck: [
-    URange(0x1C5A, 0x1C77),  # Ol Chiki
-  ],
-  Script.Brai: [
-    URange(0x2800, 0x28FF),  # Braille Patterns
-  ],
-  Script.Glag: [
-    URange(0x2C00, 0x2C5F),  # Glagolitic
-  ],
-  Script.Tfng: [
-    URange(0x2D30, 0x2D67),  # Tifinagh
-  ],
-  Script.Hani: [
-    URange(0x2E80, 0x2FDF),  # CJK Radicals Supplement +
-                             # Kangxi Radicals
-    URange(0x3190, 0x319F),  # Kanbun
-    URange(0x31C0, 0x31EF),  # CJK Strokes
-    URange(0x3400, 0x9FFF),  # CJK Unified Ideographs Extension A +
-                             # Yijing Hexagram Symbols +
-                             # CJK Unified Ideographs
-    URange(0xF900, 0xFAFF),  # CJK Compatibility Ideographs
-    URange(0x20000, 0x2A6DF),  # CJK Unified Ideographs Extension B
-    URange(0x2A700, 0x2EBEF),  # CJK Unified Ideographs Extension C +
-                               # CJK Unified Ideographs Extension D +
-                               # CJK Unified Ideographs Extension E +
-                               # CJK Unified Ideographs Extension F
-    URange(0x2F800, 0x2FA1F),  # CJK Compatibility Ideographs Suppl.
-    URange(0x30000, 0x3134F),  # CJK Unified Ideographs Extension G
-  ],
-  Script.Hrkt: [
-    URange(0x3040, 0x30FF),  # Hiragana + Katakana
-    URange(0x31F0, 0x31FF),  # Katakana Phonetic Extensions
-    URange(0xFF66, 0xFF9F),  # Halfwidth and Fullwidth Forms
-    URange(0x1AFF0, 0x1B16F),  # Kana Extended-B + Kana Supplement +
-                               # Kana Extended-A +
-                               # Small Kana Extension
-  ],
-  Script.Bopo: [
-    URange(0x3100, 0x312F),  # Bopomofo
-    URange(0x31A0, 0x31BF),  # Bopomofo Extended
-  ],
-  Script.Yiii: [
-    URange(0xA000, 0xA4CF),  # Yi Syllables + Yi Radicals
-  ],
-  Script.Lisu: [
-    URange(0xA4D0, 0xA4FD),  # Lisu
-    URange(0x11FB0, 0x11FB0),  # Lisu Supplement
-  ],
-  Script.Vaii: [
-    URange(0xA500, 0xA60D),  # Vai
-    URange(0xA610, 0xA62B),  # "
-  ],
-  Script.Bamu: [
-    URange(0xA6A0, 0xA6EF),  # Bamum
-    URange(0x16800, 0x16A3F),  # Bamum Supplement
-  ],
-  Script.Sylo: [
-    URange(0xA800, 0xA801),  # Syloti Nagri
-    URange(0xA803, 0xA805),  # "
-    URange(0xA807, 0xA80A),  # "
-    URange(0xA80C, 0xA822),  # "
-  ],
-  Script.Phag: [
-    URange(0xA840, 0xA866),  # Phags-pa
-    URange(0xA869, 0xA870),  # "
-  ],
-  Script.Saur: [
-    URange(0xA882, 0xA8B3),  # Saurashtra
-  ],
-  Script.Kali: [
-    URange(0xA90A, 0xA925),  # Kayah Li
-  ],
-  Script.Rjng: [
-    URange(0xA930, 0xA946),  # Rejang
-  ],
-  Script.Java: [
-    URange(0xA984, 0xA9B2),  # Javanese
-  ],
-  Script.Cham: [
-    URange(0xAA00, 0xAA28),  # Cham
-    URange(0xAA40, 0xAA4B),  # "
-  ],
-  Script.Tavt: [
-    URange(0xAA80, 0xAAAF),  # Tai Viet
-    URange(0xAADB, 0xAADC),  # "
-  ],
-  Script.Mtei: [
-    URange(0xAAE0, 0xAAEA),  # Meetei Mayek Extensions
-    URange(0xABC0, 0xABE2),  # Meetei Mayek
-  ],
-  Script.Linb: [
-    URange(0x10000, 0x100FF),  # Linear B Syllabary +
-                               # Linear B Ideograms
-  ],
-  Script.PHAISTOS: [
-    URange(0x101D0, 0x101FC),  # Phaistos Disc
-  ],
-  Script.Lyci: [
-    URange(0x10280, 0x1029F),  # Lycian
-  ],
-  Script.Cari: [
-    URange(0x102A0, 0x102DF),  # Carian
-  ],
-  Script.Ital: [
-    URange(0x10300, 0x1031F),  # Old Italic
-    URange(0x1032D, 0x1032F),  # "
-  ],
-  Script.Goth: [
-    URange(0x10330, 0x1034F),  # Gothic
-  ],
-  Script.Perm: [
-    URange(0x10350, 0x10375),  # Old Permic
-  ],
-  Script.Ugar: [
-    URange(0x10380, 0x1039D),  # Ugaritic
-  ],
-  Script.Xpeo: [
-    URange(0x103A0, 0x103CF),  # Old Persian
-  ],
-  Script.Dsrt: [
-    URange(0x10400, 0x1044F),  # Deseret
-  ],
-  Script.Shaw: [
-    URange(0x10450, 0x1047F),  # Shavian
-  ],
-  Script.Osma: [
-    URange(0x10480, 0x1049F),  # Osmanya
-  ],
-  Script.Osge: [
-    URange(0x104B0, 0x104FF),  # Osage
-  ],
-  Script.Elba: [
-    URange(0x10500, 0x1052F),  # Elbasan
-  ],
-  Script.Aghb: [
-    URange(0x10530, 0x10563),  # Caucasian Albanian
-  ],
-  Script.Vith: [
-    URange(0x10570, 0x105BF),  # Vithkuqi
-  ],
-  Script.Lina: [
-    URange(0x10600, 0x1073F),  # Linear A
-    URange(0x10760, 0x1076F),  # "
-  ],
-  Script.Cprt: [
-    URange(0x10800, 0x1083F),  # Cypriot Syllabary
-  ],
-  Script.Armi: [
-    URange(0x10840, 0x10855),  # Imperial Aramaic
-  ],
-  Script.Palm: [
-    URange(0x10860, 0x10876),  # Palmyrene
-  ],
-  Script.Nbat: [
-    URange(0x10880, 0x1089E),  # Nabataean
-  ],
-  Script.Hatr: [
-    URange(0x108E0, 0x108F5),  # Hatran
-  ],
-  Script.Phnx: [
-    URange(0x10900, 0x10915),  # Phoenician
-  ],
-  Script.Lydi: [
-    URange(0x10920, 0x10939),  # Lydian
-  ],
-  Script.Mero: [
-    URange(0x10980, 0x1099D),  # Meroitic Hieroglyphs
-  ],
-  Script.Merc: [
-    URange(0x109A0, 0x109B7),  # Meroitic Cursive
-  ],
-  Script.Khar: [
-    URange(0x10A00, 0x10A00),  # Kharoshthi
-    URange(0x10A10, 0x10A35),  # "
-  ],
-  Script.Sarb: [
-    URange(0x10A60, 0x10A7C),  # Old South Arabian
-  ],
-  Script.Narb: [
-    URange(0x10A80, 0x10A9C),  # Old North Arabian
-  ],
-  Script.Mani: [
-    URange(0x10AC0, 0x10AE4),  # Manichaean
-  ],
-  Script.Avst: [
-    URange(0x10B00, 0x10B35),  # Avestan
-  ],
-  Script.Prti: [
-    URange(0x10B40, 0x10B55),  # Inscriptional Parthian
-  ],
-  Script.Phli: [
-    URange(0x10B60, 0x10B72),  # Inscriptional Pahlavi
-  ],
-  Script.Phlp: [
-    URange(0x10B80, 0x10B91),  # Psalter Pahlavi
-  ],
-  Script.Orkh: [
-    URange(0x10C00, 0x10C48),  # Old Turkic
-  ],
-  Script.Hung: [
-    URange(0x10C80, 0x10CB2),  # Old Hungarian
-    URange(0x10CC0, 0x10CF2),  # "
-  ],
-  Script.Rohg: [
-    URange(0x10D00, 0x10D23),  # Hanifi Rohingya
-  ],
-  Script.Yezi: [
-    URange(0x10E80, 0x10EA9),  # Yezidi
-    URange(0x10EB0, 0x10EB1),  # "
-  ],
-  Script.Sogo: [
-    URange(0x10F00, 0x10F1C),  # Old Sogdian
-    URange(0x10F27, 0x10F27),  # "
-  ],
-  Script.Sogd: [
-    URange(0x10F30, 0x10F45),  # Sogdian
-  ],
-  Script.Ougr: [
-    URange(0x10F70, 0x10F81),  # Old Uyghur
-  ],
-  Script.Chrs: [
-    URange(0x10FB0, 0x10FC4),  # Chorasmian
-  ],
-  Script.Elym: [
-    URange(0x10FE0, 0x10FF6),  # Elymaic
-  ],
-  Script.Brah: [
-    URange(0x11005, 0x11037),  # Brahmi
-    URange(0x11071, 0x11071),  # "
-    URange(0x11075, 0x11075),  # "
-  ],
-  Script.Kthi: [
-    URange(0x11083, 0x110AF),  # Kaithi
-  ],
-  Script.Sora: [
-    URange(0x110D0, 0x110E8),  # Sora Sompeng
-  ],
-  Script.Cakm: [
-    URange(0x11103, 0x11126),  # Chakma
-    URange(0x11144, 0x11144),  # "
-    URange(0x11147, 0x11147),  # "
-  ],
-  Script.Mahj: [
-    URange(0x11150, 0x11172),  # Mahajani
-    URange(0x11176, 0x11176),  # "
-  ],
-  Script.Shrd: [
-    URange(0x11183, 0x111B2),  # Sharada
-  ],
-  Script.Khoj: [
-    URange(0x11200, 0x1122B),  # Khojki
-  ],
-  Script.Mult: [
-    URange(0x11280, 0x112A8),  # Multani
-  ],
-  Script.Sind: [
-    URange(0x112B0, 0x112DE),  # Khudawadi
-  ],
-  Script.Gran: [
-    URange(0x11305, 0x11339),  # Grantha
-    URange(0x1135E, 0x11361),  # "
-  ],
-  Script.Newa: [
-    URange(0x11400, 0x11434),  # Newa
-    URange(0x1145F, 0x1145F),  # "
-  ],
-  Script.Tirh: [
-    URange(0x11481, 0x114AF),  # Tirhuta
-  ],
-  Script.Sidd: [
-    URange(0x11580, 0x115AE),  # Siddham
-    URange(0x115D8, 0x115DB),  # "
-  ],
-  Script.Modi: [
-    URange(0x11600, 0x1162F),  # Modi
-  ],
-  Script.Takr: [
-    URange(0x11680, 0x116AA),  # Takri
-    URange(0x116B8, 0x116B8),  # "
-  ],
-  Script.Ahom: [
-    URange(0x11700, 0x1171A),  # Ahom
-    URange(0x11740, 0x11746),  # "
-  ],
-  Script.Dogr: [
-    URange(0x11800, 0x1182B),  # Dogra
-  ],
-  Script.Wara: [
-    URange(0x118A0, 0x118DF),  # Warang Citi
-  ],
-  Script.Diak: [
-    URange(0x11900, 0x1192F),  # Dives Akuru
-  ],
-  Script.Nand: [
-    URange(0x119A0, 0x119D0),  # Nandinagari
-  ],
-  Script.Zanb: [
-    URange(0x11A00, 0x11A00),  # Zanabazar Square
-    URange(0x11A0B, 0x11A32),  # "
-  ],
-  Script.Soyo: [
-    URange(0x11A50, 0x11A50),  # Soyombo
-    URange(0x11A5C, 0x11A83),  # "
-  ],
-  Script.Pauc: [
-    URange(0x11AC0, 0x11AE4),  # Pauc Cin Hau
-  ],
-  Script.Bhks: [
-    URange(0x11C00, 0x11C2E),  # Bhaiksuki
-  ],
-  Script.Marc: [
-    URange(0x11C72, 0x11CAF),  # Marchen
-  ],
-  Script.Gonm: [
-    URange(0x11D00, 0x11D30),  # Masaram Gondi
-  ],
-  Script.Gong: [
-    URange(0x11D60, 0x11D89),  # Gunjala Gondi
-  ],
-  Script.Maka: [
-    URange(0x11EE0, 0x11EF2),  # Makasar
-  ],
-  Script.Xsux: [
-    URange(0x12000, 0x123FF),  # Cuneiform
-    URange(0x12480, 0x1254F),  # Early Dynastic Cuneiform
-  ],
-  Script.Cpmn: [
-    URange(0x12F90, 0x12FF0),  # Cypro-Minoan
-  ],
-  Script.Egyp: [
-    URange(0x13000, 0x1342F),  # Egyptian Hieroglyphs
-  ],
-  Script.Hluw: [
-    URange(0x14400, 0x1467F),  # Anatolian Hieroglyphs
-  ],
-  Script.Mroo: [
-    URange(0x16A40, 0x16A5E),  # Mro
-  ],
-  Script.Tnsa: [
-    URange(0x16A70, 0x16ABE),  # Tangsa
-  ],
-  Script.Bass: [
-    URange(0x16AD0, 0x16AED),  # Bassa Vah
-  ],
-  Script.Hmng: [
-    URange(0x16B00, 0x16B2F),  # Pahawh Hmong
-    URange(0x16B63, 0x16B8F),  # "
-  ],
-  Script.Medf: [
-    URange(0x16E40, 0x16E7F),  # Medefaidrin
-    URange(0x16E99, 0x16E9A),  # "
-  ],
-  Script.Plrd: [
-    URange(0x16F00, 0x16F4A),  # Miao
-  ],
-  Script.Tang: [
-    URange(0x17000, 0x18AFF),  # Tangut + Tangut Components
-    URange(0x18D00, 0x18D08),  # Tangut Supplement
-  ],
-  Script.Kits: [
-    URange(0x18B00, 0x18CFF),  # Khitan Small Script
-  ],
-  Script.Nshu: [
-    URange(0x1B170, 0x1B2FF),  # Nushu
-  ],
-  Script.Dupl: [
-    URange(0x1BC00, 0x1BC6A),  # Duployan
-  ],
-  Script.Sgnw: [
-    URange(0x1D800, 0x1DA8B),  # SignWriting
-  ],
-  Script.Hmnp: [
-    URange(0x1E100, 0x1E12C),  # Nyiakeng Puache Hmong
-    URange(0x1E137, 0x1E13D),  # "
-    URange(0x1E14E, 0x1E14F),  # "
-  ],
-  Script.Toto: [
-    URange(0x1E290, 0x1E2AD),  # Toto
-  ],
-  Script.Wcho: [
-    URange(0x1E2C0, 0x1E2EB),  # Wancho
-  ],
-  Script.Mend: [
-    URange(0x1E800, 0x1E8C4),  # Mende Kikakui
-  ],
-  Script.Adlm: [
-    URange(0x1E900, 0x1E943),  # Adlam
-  ],
+def _BuildData():
+  # Comments indicate the official title(s) of the Unicode Block.
+  return {
+    Script.Latn: [
+      URange(0x0041, 0x005A),  # Basic Latin
+      URange(0x0061, 0x007A),  # Latin-1 Supplement
+      URange(0x00C0, 0x00D6),  # "
+      URange(0x00D8, 0x00F6),  # "
+      URange(0x00F8, 0x00FF),  # "
+      URange(0x0100, 0x02AF),  # Latin Extended-A + Latin Extended-B +
+                               # IPA Extensions
+      URange(0x1E00, 0x1EFF),  # Latin Extended Additional
+      URange(0x1D00, 0x1D25),  # Phonetic Extensions
+      URange(0x1D6C, 0x1D9A),  # " + Phonetic Extensions Supplement
+      URange(0x2C60, 0x2C7B),  # Latin Extended-C
+      URange(0x2C7E, 0x2C7F),  # "
+      URange(0xA722, 0xA787),  # Latin Extended-D
+      URange(0xA78B, 0xA7D9),  # "
+      URange(0xA7F5, 0xA7F7),  # "
+      URange(0xA7FA, 0xA7FF),  # "
+      URange(0xAB30, 0xAB5A),  # Latin Extended-E
+      URange(0xAB60, 0xAB68),  # "
+      URange(0xFB00, 0xFB06),  # Alphabetic Presentation Forms
+      URange(0x1DF00, 0x1DF1E),  # Latin Extended-G
+    ],
+    Script.Grek: [
+      URange(0x0370, 0x0373),  # Greek and Coptic
+      URange(0x0376, 0x0377),  # "
+      URange(0x037B, 0x037D),  # "
+      URange(0x037F, 0x037F),  # "
+      URange(0x0386, 0x0386),  # "
+      URange(0x0388, 0x03E1),  # "
+      URange(0x03F0, 0x03FF),  # "
+      URange(0x1F00, 0x1FBC),  # Greek Extended
+      URange(0x1FC2, 0x1FCC),  # "
+      URange(0x1FD0, 0x1FDC),  # "
+      URange(0x1FE0, 0x1FEC),  # "
+      URange(0x1FF0, 0x1FFC),  # "
+      URange(0x1D26, 0x1D2A),  # Phonetic Extensions
+    ],
+    Script.Copt: [
+      URange(0x03E2, 0x03EF),  # Greek and Coptic
+      URange(0x2C80, 0x2CEF),  # Coptic
+      URange(0x2CF2, 0x2CF3),  # "
+    ],
+    Script.Cyrl: [
+      URange(0x0400, 0x0481),  # Cyrillic
+      URange(0x048A, 0x052F),  # " + Cyrillic Supplement
+      URange(0x1C80, 0x1C88),  # Cyrillic Extended-C
+      URange(0x1D2B, 0x1D2B),  # Phonetic Extensions
+      URange(0xA640, 0xA66E),  # Cyrillic Extended-B
+      URange(0xA680, 0xA69B),  # "
+    ],
+    Script.Armn: [
+      URange(0x0531, 0x0556),  # Armenian
+      URange(0x0560, 0x0588),  # "
+      URange(0xFB13, 0xFB17),  # Alphabetic Presentation Forms
+    ],
+    Script.Hebr: [
+      URange(0x05D0, 0x05F2),  # Hebrew
+      URange(0xFB1D, 0xFB4F),  # Alphabetic Presentation Forms
+    ],
+    Script.Arab: [
+      URange(0x0620, 0x063F),  # Arabic
+      URange(0x0641, 0x064A),  # "
+      URange(0x066E, 0x066F),  # "
+      URange(0x0671, 0x0673),  # "
+      URange(0x0675, 0x06D3),  # "
+      URange(0x06D5, 0x06D5),  # "
+      URange(0x06EE, 0x06EF),  # "
+      URange(0x06FA, 0x06FF),  # "
+      URange(0x0750, 0x077F),  # Arabic Supplement
+      URange(0x0870, 0x0882),  # Arabic Extended-B
+      URange(0x0886, 0x0886),  # "
+      URange(0x0889, 0x088D),  # "
+      URange(0x08A0, 0x08C8),  # Arabic Extended-A
+      URange(0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
+      URange(0xFE70, 0xFEFC),  # Arabic Presentation Forms-B
+    ],
+    Script.Syrc: [
+      URange(0x0710, 0x0710),  # Syriac
+      URange(0x0712, 0x072F),  # "
+      URange(0x074D, 0x074F),  # "
+      URange(0x0860, 0x086A),  # Syriac Supplement
+    ],
+    Script.Thaa: [
+      URange(0x0780, 0x07A5),  # Thaana
+      URange(0x07B1, 0x07B1),  # "
+    ],
+    Script.Nkoo: [
+      URange(0x07CA, 0x07EA),  # NKo
+    ],
+    Script.Samr: [
+      URange(0x0800, 0x0815),  # Samaritan
+    ],
+    Script.Mand: [
+      URange(0x0840, 0x0858),  # Mandaic
+    ],
+    Script.Deva: [
+      URange(0x0904, 0x0939),  # Devanagari
+      URange(0x0958, 0x0961),  # "
+      URange(0x0972, 0x097F),  # "
+      URange(0xA8FE, 0xA8FE),  # Devanagari Extended
+    ],
+    Script.Beng: [
+      URange(0x0985, 0x09B9),  # Bengali
+      URange(0x09CE, 0x09CE),  # "
+      URange(0x09DC, 0x09E1),  # "
+      URange(0x09F0, 0x09F1),  # "
+      URange(0x09FC, 0x09FC),  # "
+    ],
+    Script.Guru: [
+      URange(0x0A05, 0x0A39),  # Gurmukhi
+      URange(0x0A59, 0x0A5E),  # "
+    ],
+    Script.Gujr: [
+      URange(0x0A85, 0x0AB9),  # Gujarati
+      URange(0x0AE0, 0x0AE1),  # "
+      URange(0x0AF9, 0x0AF9),  # "
+    ],
+    Script.Orya: [
+      URange(0x0B05, 0x0B39),  # Oriya
+      URange(0x0B5C, 0x0B61),  # "
+      URange(0x0B71, 0x0B71),  # "
+    ],
+    Script.Taml: [
+      URange(0x0B85, 0x0BB9),  # Tamil
+    ],
+    Script.Telu: [
+      URange(0x0C05, 0x0C39),  # Telugu
+      URange(0x0C58, 0x0C61),  # "
+    ],
+    Script.Knda: [
+      URange(0x0C85, 0x0CB9),  # Kannada
+      URange(0x0CDD, 0x0CE1),  # "
+    ],
+    Script.Mlym: [
+      URange(0x0D04, 0x0D3A),  # Malayalam
+      URange(0x0D54, 0x0D56),  # "
+      URange(0x0D5F, 0x0D61),  # "
+      URange(0x0D7A, 0x0D7F),  # "
+    ],
+    Script.Sinh: [
+      URange(0x0D85, 0x0DC6),  # Sinhala
+    ],
+    Script.Thai: [
+      URange(0x0E01, 0x0E2E),  # Thai
+    ],
+    Script.Laoo: [
+      URange(0x0E81, 0x0EAE),  # Lao
+      URange(0x0EDE, 0x0EDF),  # "
+    ],
+    Script.Tibt: [
+      URange(0x0F40, 0x0F6C),  # Tibetan
+    ],
+    Script.Mymr: [
+      URange(0x1000, 0x102A),  # Myanmar
+      URange(0x103F, 0x103F),  # "
+      URange(0x104C, 0x1055),  # "
+      URange(0x105A, 0x105D),  # "
+      URange(0x1061, 0x1061),  # "
+      URange(0x1065, 0x1066),  # "
+      URange(0x106E, 0x1070),  # "
+      URange(0x1075, 0x1082),  # "
+      URange(0x108E, 0x108E),  # "
+      URange(0xA9E0, 0xA9E4),  # Myanmar Extended-B
+      URange(0xA9E7, 0xA9EF),  # "
+      URange(0xA9FA, 0xA9FE),  # "
+      URange(0xAA60, 0xAA6F),  # Myanmar Extended-A
+      URange(0xAA74, 0xAA76),  # "
+      URange(0xAA78, 0xAA7A),  # "
+      URange(0xAA7E, 0xAA7F),  # "
+    ],
+    Script.Geor: [
+      URange(0x10A0, 0x10FA),  # Georgian
+      URange(0x10FC, 0x10FF),  # "
+      URange(0x1C90, 0x1CBF),  # Georgian Extended
+      URange(0x2D00, 0x2D2D),  # Georgian Supplement
+    ],
+    Script.Hang: [
+      URange(0x1100, 0x115E),  # Hangul Jamo
+      URange(0x1161, 0x11FF),  # "
+      URange(0x3131, 0x3163),  # Hangul Compatibility Jamo
+      URange(0x3165, 0x318E),  # "
+      URange(0xA960, 0xA97F),  # Hangul Jamo Extended-A
+      URange(0xAC00, 0xD7FF),  # Hangul Syllables +
+                               # Hangul Jamo Extended-B
+      URange(0xFFA1, 0xFFDF),  # Halfwidth and Fullwidth Forms
+    ],
+    Script.Ethi: [
+      URange(0x1200, 0x135A),  # Ethiopic
+      URange(0x1380, 0x138F),  # Ethiopic Supplement
+      URange(0x2D80, 0x2DDF),  # Ethiopic Extended
+      URange(0xAB00, 0xAB2F),  # Ethiopic Extended-A
+      URange(0x1E7E0, 0x1E7FF),  # Ethiopic Extended-B
+    ],
+    Script.Cher: [
+      URange(0x13A0, 0x13FF),  # Cherokee
+      URange(0xAB70, 0xABBF),  # Cherokee Supplement
+    ],
+    Script.Cans: [
+      URange(0x1401, 0x166C),  # Unified Canadian Aboriginal Syllabics
+      URange(0x166F, 0x167F),  # "
+      URange(0x18B0, 0x18F5),  # U.C.A.S. Extended
+      URange(0x11AB0, 0x11ABF),  # U.C.A.S. Extended-A
+    ],
+    Script.Ogam: [
+      URange(0x1681, 0x169A),  # Ogham
+    ],
+    Script.Runr: [
+      URange(0x16A0, 0x16EA),  # Runic
+      URange(0x16F1, 0x16F8),  # "
+    ],
+    Script.Tglg: [
+      URange(0x1700, 0x1711),  # Tagalog
+      URange(0x171F, 0x171F),  # "
+    ],
+    Script.Hano: [
+      URange(0x1720, 0x1731),  # Hanunoo
+    ],
+    Script.Buhd: [
+      URange(0x1740, 0x1751),  # Buhid
+    ],
+    Script.Tagb: [
+      URange(0x1760, 0x1770),  # Tagbanwa
+    ],
+    Script.Khmr: [
+      URange(0x1780, 0x17B3),  # Khmer
+    ],
+    Script.Mong: [
+      URange(0x1820, 0x18AA),  # Mongolian
+    ],
+    Script.Limb: [
+      URange(0x1900, 0x191E),  # Limbu
+    ],
+    Script.Tale: [
+      URange(0x1950, 0x1974),  # Tai Le
+    ],
+    Script.Talu: [
+      URange(0x1980, 0x19C9),  # New Tai Lue
+    ],
+    Script.Bugi: [
+      URange(0x1A00, 0x1A16),  # Buginese
+    ],
+    Script.Lana: [
+      URange(0x1A20, 0x1A54),  # Tai Tham
+      URange(0x1AA0, 0x1AA2),  # "
+    ],
+    Script.Bali: [
+      URange(0x1B05, 0x1B33),  # Balinese
+      URange(0x1B45, 0x1B4C),  # "
+    ],
+    Script.Sund: [
+      URange(0x1B83, 0x1BA0),  # Sundanese
+      URange(0x1BAE, 0x1BAF),  # "
+      URange(0x1BBB, 0x1BBF),  # "
+    ],
+    Script.Batk: [
+      URange(0x1BC0, 0x1BE5),  # Batak
+    ],
+    Script.Lepc: [
+      URange(0x1C00, 0x1C23),  # Lepcha
+      URange(0x1C4D, 0x1C4F),  # "
+    ],
+    Script.Olck: [
+      URange(0x1C5A, 0x1C77),  # Ol Chiki
+    ],
+    Script.Brai: [
+      URange(0x2800, 0x28FF),  # Braille Patterns
+    ],
+    Script.Glag: [
+      URange(0x2C00, 0x2C5F),  # Glagolitic
+    ],
+    Script.Tfng: [
+      URange(0x2D30, 0x2D67),  # Tifinagh
+    ],
+    Script.Hani: [
+      URange(0x2E80, 0x2FDF),  # CJK Radicals Supplement +
+                               # Kangxi Radicals
+      URange(0x3190, 0x319F),  # Kanbun
+      URange(0x31C0, 0x31EF),  # CJK Strokes
+      URange(0x3400, 0x9FFF),  # CJK Unified Ideographs Extension A +
+                               # Yijing Hexagram Symbols +
+                               # CJK Unified Ideographs
+      URange(0xF900, 0xFAFF),  # CJK Compatibility Ideographs
+      URange(0x20000, 0x2A6DF),  # CJK Unified Ideographs Extension B
+      URange(0x2A700, 0x2EBEF),  # CJK Unified Ideographs Extension C +
+                                 # CJK Unified Ideographs Extension D +
+                                 # CJK Unified Ideographs Extension E +
+                                 # CJK Unified Ideographs Extension F
+      URange(0x2F800, 0x2FA1F),  # CJK Compatibility Ideographs Suppl.
+      URange(0x30000, 0x3134F),  # CJK Unified Ideographs Extension G
+    ],
+    Script.Hrkt: [
+      URange(0x3040, 0x30FF),  # Hiragana + Katakana
+      URange(0x31F0, 0x31FF),  # Katakana Phonetic Extensions
+      URange(0xFF66, 0xFF9F),  # Halfwidth and Fullwidth Forms
+      URange(0x1AFF0, 0x1B16F),  # Kana Extended-B + Kana Supplement +
+                                 # Kana Extended-A +
+                                 # Small Kana Extension
+    ],
+    Script.Bopo: [
+      URange(0x3100, 0x312F),  # Bopomofo
+      URange(0x31A0, 0x31BF),  # Bopomofo Extended
+    ],
+    Script.Yiii: [
+      URange(0xA000, 0xA4CF),  # Yi Syllables + Yi Radicals
+    ],
+    Script.Lisu: [
+      URange(0xA4D0, 0xA4FD),  # Lisu
+      URange(0x11FB0, 0x11FB0),  # Lisu Supplement
+    ],
+    Script.Vaii: [
+      URange(0xA500, 0xA60D),  # Vai
+      URange(0xA610, 0xA62B),  # "
+    ],
+    Script.Bamu: [
+      URange(0xA6A0, 0xA6EF),  # Bamum
+      URange(0x16800, 0x16A3F),  # Bamum Supplement
+    ],
+    Script.Sylo: [
+      URange(0xA800, 0xA801),  # Syloti Nagri
+      URange(0xA803, 0xA805),  # "
+      URange(0xA807, 0xA80A),  # "
+      URange(0xA80C, 0xA822),  # "
+    ],
+    Script.Phag: [
+      URange(0xA840, 0xA866),  # Phags-pa
+      URange(0xA869, 0xA870),  # "
+    ],
+    Script.Saur: [
+      URange(0xA882, 0xA8B3),  # Saurashtra
+    ],
+    Script.Kali: [
+      URange(0xA90A, 0xA925),  # Kayah Li
+    ],
+    Script.Rjng: [
+      URange(0xA930, 0xA946),  # Rejang
+    ],
+    Script.Java: [
+      URange(0xA984, 0xA9B2),  # Javanese
+    ],
+    Script.Cham: [
+      URange(0xAA00, 0xAA28),  # Cham
+      URange(0xAA40, 0xAA4B),  # "
+    ],
+    Script.Tavt: [
+      URange(0xAA80, 0xAAAF),  # Tai Viet
+      URange(0xAADB, 0xAADC),  # "
+    ],
+    Script.Mtei: [
+      URange(0xAAE0, 0xAAEA),  # Meetei Mayek Extensions
+      URange(0xABC0, 0xABE2),  # Meetei Mayek
+    ],
+    Script.Linb: [
+      URange(0x10000, 0x100FF),  # Linear B Syllabary +
+                                 # Linear B Ideograms
+    ],
+    Script.PHAISTOS: [
+      URange(0x101D0, 0x101FC),  # Phaistos Disc
+    ],
+    Script.Lyci: [
+      URange(0x10280, 0x1029F),  # Lycian
+    ],
+    Script.Cari: [
+      URange(0x102A0, 0x102DF),  # Carian
+    ],
+    Script.Ital: [
+      URange(0x10300, 0x1031F),  # Old Italic
+      URange(0x1032D, 0x1032F),  # "
+    ],
+    Script.Goth: [
+      URange(0x10330, 0x1034F),  # Gothic
+    ],
+    Script.Perm: [
+      URange(0x10350, 0x10375),  # Old Permic
+    ],
+    Script.Ugar: [
+      URange(0x10380, 0x1039D),  # Ugaritic
+    ],
+    Script.Xpeo: [
+      URange(0x103A0, 0x103CF),  # Old Persian
+    ],
+    Script.Dsrt: [
+      URange(0x10400, 0x1044F),  # Deseret
+    ],
+    Script.Shaw: [
+      URange(0x10450, 0x1047F),  # Shavian
+    ],
+    Script.Osma: [
+      URange(0x10480, 0x1049F),  # Osmanya
+    ],
+    Script.Osge: [
+      URange(0x104B0, 0x104FF),  # Osage
+    ],
+    Script.Elba: [
+      URange(0x10500, 0x1052F),  # Elbasan
+    ],
+    Script.Aghb: [
+      URange(0x10530, 0x10563),  # Caucasian Albanian
+    ],
+    Script.Vith: [
+      URange(0x10570, 0x105BF),  # Vithkuqi
+    ],
+    Script.Lina: [
+      URange(0x10600, 0x1073F),  # Linear A
+      URange(0x10760, 0x1076F),  # "
+    ],
+    Script.Cprt: [
+      URange(0x10800, 0x1083F),  # Cypriot Syllabary
+    ],
+    Script.Armi: [
+      URange(0x10840, 0x10855),  # Imperial Aramaic
+    ],
+    Script.Palm: [
+      URange(0x10860, 0x10876),  # Palmyrene
+    ],
+    Script.Nbat: [
+      URange(0x10880, 0x1089E),  # Nabataean
+    ],
+    Script.Hatr: [
+      URange(0x108E0, 0x108F5),  # Hatran
+    ],
+    Script.Phnx: [
+      URange(0x10900, 0x10915),  # Phoenician
+    ],
+    Script.Lydi: [
+      URange(0x10920, 0x10939),  # Lydian
+    ],
+    Script.Mero: [
+      URange(0x10980, 0x1099D),  # Meroitic Hieroglyphs
+    ],
+    Script.Merc: [
+      URange(0x109A0, 0x109B7),  # Meroitic Cursive
+    ],
+    Script.Khar: [
+      URange(0x10A00, 0x10A00),  # Kharoshthi
+      URange(0x10A10, 0x10A35),  # "
+    ],
+    Script.Sarb: [
+      URange(0x10A60, 0x10A7C),  # Old South Arabian
+    ],
+    Script.Narb: [
+      URange(0x10A80, 0x10A9C),  # Old North Arabian
+    ],
+    Script.Mani: [
+      URange(0x10AC0, 0x10AE4),  # Manichaean
+    ],
+    Script.Avst: [
+      URange(0x10B00, 0x10B35),  # Avestan
+    ],
+    Script.Prti: [
+      URange(0x10B40, 0x10B55),  # Inscriptional Parthian
+    ],
+    Script.Phli: [
+      URange(0x10B60, 0x10B72),  # Inscriptional Pahlavi
+    ],
+    Script.Phlp: [
+      URange(0x10B80, 0x10B91),  # Psalter Pahlavi
+    ],
+    Script.Orkh: [
+      URange(0x10C00, 0x10C48),  # Old Turkic
+    ],
+    Script.Hung: [
+      URange(0x10C80, 0x10CB2),  # Old Hungarian
+      URange(0x10CC0, 0x10CF2),  # "
+    ],
+    Script.Rohg: [
+      URange(0x10D00, 0x10D23),  # Hanifi Rohingya
+    ],
+    Script.Yezi: [
+      URange(0x10E80, 0x10EA9),  # Yezidi
+      URange(0x10EB0, 0x10EB1),  # "
+    ],
+    Script.Sogo: [
+      URange(0x10F00, 0x10F1C),  # Old Sogdian
+      URange(0x10F27, 0x10F27),  # "
+    ],
+    Script.Sogd: [
+      URange(0x10F30, 0x10F45),  # Sogdian
+    ],
+    Script.Ougr: [
+      URange(0x10F70, 0x10F81),  # Old Uyghur
+    ],
+    Script.Chrs: [
+      URange(0x10FB0, 0x10FC4),  # Chorasmian
+    ],
+    Script.Elym: [
+      URange(0x10FE0, 0x10FF6),  # Elymaic
+    ],
+    Script.Brah: [
+      URange(0x11005, 0x11037),  # Brahmi
+      URange(0x11071, 0x11071),  # "
+      URange(0x11075, 0x11075),  # "
+    ],
+    Script.Kthi: [
+      URange(0x11083, 0x110AF),  # Kaithi
+    ],
+    Script.Sora: [
+      URange(0x110D0, 0x110E8),  # Sora Sompeng
+    ],
+    Script.Cakm: [
+      URange(0x11103, 0x11126),  # Chakma
+      URange(0x11144, 0x11144),  # "
+      URange(0x11147, 0x11147),  # "
+    ],
+    Script.Mahj: [
+      URange(0x11150, 0x11172),  # Mahajani
+      URange(0x11176, 0x11176),  # "
+    ],
+    Script.Shrd: [
+      URange(0x11183, 0x111B2),  # Sharada
+    ],
+    Script.Khoj: [
+      URange(0x11200, 0x1122B),  # Khojki
+    ],
+    Script.Mult: [
+      URange(0x11280, 0x112A8),  # Multani
+    ],
+    Script.Sind: [
+      URange(0x112B0, 0x112DE),  # Khudawadi
+    ],
+    Script.Gran: [
+      URange(0x11305, 0x11339),  # Grantha
+      URange(0x1135E, 0x11361),  # "
+    ],
+    Script.Newa: [
+      URange(0x11400, 0x11434),  # Newa
+      URange(0x1145F, 0x1145F),  # "
+    ],
+    Script.Tirh: [
+      URange(0x11481, 0x114AF),  # Tirhuta
+    ],
+    Script.Sidd: [
+      URange(0x11580, 0x115AE),  # Siddham
+      URange(0x115D8, 0x115DB),  # "
+    ],
+    Script.Modi: [
+      URange(0x11600, 0x1162F),  # Modi
+    ],
+    Script.Takr: [
+      URange(0x11680, 0x116AA),  # Takri
+      URange(0x116B8, 0x116B8),  # "
+    ],
+    Script.Ahom: [
+      URange(0x11700, 0x1171A),  # Ahom
+      URange(0x11740, 0x11746),  # "
+    ],
+    Script.Dogr: [
+      URange(0x11800, 0x1182B),  # Dogra
+    ],
+    Script.Wara: [
+      URange(0x118A0, 0x118DF),  # Warang Citi
+    ],
+    Script.Diak: [
+      URange(0x11900, 0x1192F),  # Dives Akuru
+    ],
+    Script.Nand: [
+      URange(0x119A0, 0x119D0),  # Nandinagari
+    ],
+    Script.Zanb: [
+      URange(0x11A00, 0x11A00),  # Zanabazar Square
+      URange(0x11A0B, 0x11A32),  # "
+    ],
+    Script.Soyo: [
+      URange(0x11A50, 0x11A50),  # Soyombo
+      URange(0x11A5C, 0x11A83),  # "
+    ],
+    Script.Pauc: [
+      URange(0x11AC0, 0x11AE4),  # Pauc Cin Hau
+    ],
+    Script.Bhks: [
+      URange(0x11C00, 0x11C2E),  # Bhaiksuki
+    ],
+    Script.Marc: [
+      URange(0x11C72, 0x11CAF),  # Marchen
+    ],
+    Script.Gonm: [
+      URange(0x11D00, 0x11D30),  # Masaram Gondi
+    ],
+    Script.Gong: [
+      URange(0x11D60, 0x11D89),  # Gunjala Gondi
+    ],
+    Script.Maka: [
+      URange(0x11EE0, 0x11EF2),  # Makasar
+    ],
+    Script.Xsux: [
+      URange(0x12000, 0x123FF),  # Cuneiform
+      URange(0x12480, 0x1254F),  # Early Dynastic Cuneiform
+    ],
+    Script.Cpmn: [
+      URange(0x12F90, 0x12FF0),  # Cypro-Minoan
+    ],
+    Script.Egyp: [
+      URange(0x13000, 0x1342F),  # Egyptian Hieroglyphs
+    ],
+    Script.Hluw: [
+      URange(0x14400, 0x1467F),  # Anatolian Hieroglyphs
+    ],
+    Script.Mroo: [
+      URange(0x16A40, 0x16A5E),  # Mro
+    ],
+    Script.Tnsa: [
+      URange(0x16A70, 0x16ABE),  # Tangsa
+    ],
+    Script.Bass: [
+      URange(0x16AD0, 0x16AED),  # Bassa Vah
+    ],
+    Script.Hmng: [
+      URange(0x16B00, 0x16B2F),  # Pahawh Hmong
+      URange(0x16B63, 0x16B8F),  # "
+    ],
+    Script.Medf: [
+      URange(0x16E40, 0x16E7F),  # Medefaidrin
+      URange(0x16E99, 0x16E9A),  # "
+    ],
+    Script.Plrd: [
+      URange(0x16F00, 0x16F4A),  # Miao
+    ],
+    Script.Tang: [
+      URange(0x17000, 0x18AFF),  # Tangut + Tangut Components
+      URange(0x18D00, 0x18D08),  # Tangut Supplement
+    ],
+    Script.Kits: [
+      URange(0x18B00, 0x18CFF),  # Khitan Small Script
+    ],
+    Script.Nshu: [
+      URange(0x1B170, 0x1B2FF),  # Nushu
+    ],
+    Script.Dupl: [
+      URange(0x1BC00, 0x1BC6A),  # Duployan
+    ],
+    Script.Sgnw: [
+      URange(0x1D800, 0x1DA8B),  # SignWriting
+    ],
+    Script.Hmnp: [
+      URange(0x1E100, 0x1E12C),  # Nyiakeng Puache Hmong
+      URange(0x1E137, 0x1E13D),  # "
+      URange(0x1E14E, 0x1E14F),  # "
+    ],
+    Script.Toto: [
+      URange(0x1E290, 0x1E2AD),  # Toto
+    ],
+    Script.Wcho: [
+      URange(0x1E2C0, 0x1E2EB),  # Wancho
+    ],
+    Script.Mend: [
+      URange(0x1E800, 0x1E8C4),  # Mende Kikakui
+    ],
+    Script.Adlm: [
+      URange(0x1E900, 0x1E943),  # Adlam
+    ],
+  }
+
+def _BuildExtensions():
+  # Characters used by several scripts, from the Unicode
+  # ScriptExtensions.txt. Hiragana and Katakana are Hrkt, and scripts
+  # missing from Script are left out.
+  return {
+    frozenset({Script.Beng, Script.Deva, Script.Dogr, Script.Gong,
+               Script.Gonm, Script.Gran, Script.Gujr, Script.Guru,
+               Script.Knda, Script.Mahj, Script.Mlym, Script.Nand,
+               Script.Orya, Script.Sind, Script.Sinh, Script.Sylo,
+               Script.Takr, Script.Taml, Script.Telu, Script.Tirh}): [
+      URange(0x0964, 0x0965),  # Devanagari danda + double danda
+    ],
+    frozenset({Script.Arab, Script.Nkoo, Script.Rohg, Script.Syrc,
+               Script.Thaa, Script.Yezi}): [
+      URange(0x060C, 0x060C),  # Arabic comma
+      URange(0x061B, 0x061B),  # Arabic semicolon
+    ],
+    frozenset({Script.Adlm, Script.Arab, Script.Nkoo, Script.Rohg,
+               Script.Syrc, Script.Thaa, Script.Yezi}): [
+      URange(0x061F, 0x061F),  # Arabic question mark
+    ],
+    frozenset({Script.Bopo, Script.Hang, Script.Hani, Script.Hrkt,
+               Script.Yiii}): [
+      URange(0x3001, 0x3002),  # CJK Symbols and Punctuation
+      URange(0x3008, 0x3011),  # "
+      URange(0x3014, 0x301B),  # "
+      URange(0xFF61, 0xFF65),  # Halfwidth and Fullwidth Forms
+    ],
+    frozenset({Script.Bopo, Script.Hang, Script.Hani, Script.Hrkt}): [
+      URange(0x3003, 0x3003),  # CJK Symbols and Punctuation
+    ],
+  }
+
+def _BuildRangeDict():
+  data = _Get('DATA')
+  extensions = _Get('EXTENSIONS')
+  # Touching ranges of the same script in DATA, e.g. ones split at a block
+  # boundary, take a single entry. Frozen, as any thread may read it.
+  return FrozenRangeDict((r, s) for s in data for r in data[s]).merged(
+      RangeDict((r, s) for s in extensions for r in extensions[s])
+  ).coalesced()
+
+def _BuildScriptTable():
+  # Imported here to avoid a circular import.
+  from . import snapshot
+  table = snapshot.Load()
+  if table is None:
+    table = ScriptTable.from_range_dict(_Get('RANGE_DICT'))
+  return table
+
+_BUILDERS = {
+  'DATA': _BuildData,
+  'EXTENSIONS': _BuildExtensions,
+  'RANGE_DICT': _BuildRangeDict,
+  'SCRIPT_TABLE': _BuildScriptTable,
 }
 
-RANGE_DICT = RangeDict((r, s) for s in DATA for r in DATA[s])
+def __getattr__(name):
+  """Builds DATA, EXTENSIONS, RANGE_DICT and SCRIPT_TABLE on first access
+
+  Importing this module only defines Script, so that importing the
+  package stays cheap for code that never detects scripts.
+  """
+
+  try:
+    builder = _BUILDERS[name]
+  except KeyError:
+    raise AttributeError(
+        f'module {__name__!r} has no attribute {name!r}') from None
+  # Threads racing here each build an equal value and the last one is
+  # kept, which is harmless as the values are immutable.
+  value = builder()
+  # Later accesses find the value directly, without calling __getattr__.
+  globals()[name] = value
+  return value
+
+def _Get(name):
+  """Returns a global of this module, building it if needed"""
+
+  try:
+    return globals()[name]
+  except KeyError:
+    return __getattr__(name)
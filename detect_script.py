@@ -1,28 +1,1408 @@
+import collections
+import contextlib
+import functools
+import itertools
+import operator
+import os
 import re
+import threading
+import time
+import weakref
 
-from .data import Script, RANGE_DICT
+from . import data
+from .cache import LRUCache
+from .data import Script
+from .instrument import Counters
+from .script_set import MaskToScripts, ScriptSet, ScriptsToMask, SCRIPT_BITS
+from .table import BLOCK_SHIFT, BLOCK_MASK
+from .tenants import TenantTables
+
+_SCRIPT_TABLE = None
+
+def ConfigureScriptTable(table):
+  """Sets the script table used by all detection functions
+
+  Input:
+    table: ScriptTable mapping code points to Script, e.g. the
+      SCRIPT_TABLE of a module generated by ucd.py, or None for
+      data.SCRIPT_TABLE.
+  """
+
+  global _SCRIPT_TABLE
+  _SCRIPT_TABLE = table
+  cache = _CACHE
+  if cache is not None:
+    cache.clear()
+
+def _Table():
+  """Returns the configured script table
+
+  data.SCRIPT_TABLE is built on first use, see data.__getattr__().
+  """
+
+  table = _SCRIPT_TABLE
+  return data.SCRIPT_TABLE if table is None else table
 
 def DetectScript(char):
-  """Detects the script of a character"""
+  """Detects the script of a character
 
-  try:
-    return RANGE_DICT[ord(char)]
-  except KeyError:
-    return None
+  Returns a Script, a frozenset of Script for characters used by several
+  scripts (script extensions), or None.
+  """
+
+  table = _Table()
+  n = ord(char)
+  return table.values[table.blocks[table.stage1[n >> BLOCK_SHIFT]][
+      n & BLOCK_MASK]]
+
+def _PerTable(func):
+  """Caches func(table) for as long as table is alive
+
+  Unlike functools.lru_cache, results are never evicted while their table
+  is in use, e.g. by one of thousands of TenantTables, and the cache does
+  not keep tables alive.
+  """
+
+  results = {}
+  def remove(ref):
+    results.pop(ref, None)
+  @functools.wraps(func)
+  def wrapper(table):
+    try:
+      # Without a callback, weakref.ref() returns the table's existing
+      # reference, which compares equal to the key while table is alive.
+      return results[weakref.ref(table)]
+    except KeyError:
+      pass
+    result = func(table)
+    results[weakref.ref(table, remove)] = result
+    return result
+  return wrapper
+
+@_PerTable
+def _Masks(table):
+  """Returns the script bitmask of each value of table
+
+  Also returns the set of indices of values that are frozensets of
+  scripts, i.e. script extensions.
+  """
+
+  masks = tuple(0 if v is None else
+                ScriptsToMask(v) if isinstance(v, frozenset) else
+                SCRIPT_BITS[v]
+                for v in table.values)
+  extensions = frozenset(i for (i, v) in enumerate(table.values)
+                         if isinstance(v, frozenset))
+  return (masks, extensions)
+
+def _ResolveExtensions(mask, extension_masks):
+  """Resolves the scripts of characters used by several scripts
+
+  Input:
+    mask: Bitmask of the scripts of the other characters.
+    extension_masks: Bitmasks of the scripts of extension characters.
+
+  Returns a dict mapping each of extension_masks to the bitmask of the
+  scripts its characters count as: the scripts it shares with mask if
+  any, else the script shared by all such characters if there is exactly
+  one, else none, like characters without a script.
+  """
+
+  resolved = {}
+  common = -1
+  for m in extension_masks:
+    if m & mask:
+      resolved[m] = m & mask
+    else:
+      resolved[m] = None
+      common &= m
+  if not (common > 0 and common & (common - 1) == 0):
+    common = 0
+  for (m, r) in resolved.items():
+    if r is None:
+      resolved[m] = common
+  return resolved
+
+def _IndicesOfChars(table, chars):
+  """Returns the set of table value indices of distinct characters"""
+
+  # Looking up the few distinct characters of a string instead of every
+  # character keeps the Python-level loop short on long inputs; set()
+  # does the per-character work in C.
+  stage1 = table.stage1
+  blocks = table.blocks
+  return {blocks[stage1[n >> BLOCK_SHIFT]][n & BLOCK_MASK]
+          for n in map(ord, chars)}
+
+def _ResolvedMasks(table, indices):
+  """Returns the script bitmask of value indices and their extensions
+
+  See _ResolveExtensions().
+  """
+
+  (masks, extensions) = _Masks(table)
+  mask = 0
+  extension_masks = []
+  for i in indices:
+    if i in extensions:
+      extension_masks.append(masks[i])
+    else:
+      mask |= masks[i]
+  return (mask, _ResolveExtensions(mask, extension_masks))
+
+def _ScriptsOfChars(chars, table=None):
+  """Returns the set of scripts of an iterable of distinct characters"""
+
+  if table is None:
+    table = _Table()
+  indices = _IndicesOfChars(table, chars)
+  if _Masks(table)[1].isdisjoint(indices):
+    values = table.values
+    scripts = {values[i] for i in indices}
+    scripts.discard(None)
+    return scripts
+  return MaskToScripts(_MaskOfIndices(table, indices))
+
+def _MaskOfIndices(table, indices):
+  """Returns the script bitmask of a set of table value indices"""
+
+  (masks, extensions) = _Masks(table)
+  if extensions.isdisjoint(indices):
+    return functools.reduce(operator.or_, map(masks.__getitem__, indices), 0)
+  (mask, resolved) = _ResolvedMasks(table, indices)
+  for m in resolved.values():
+    mask |= m
+  return mask
 
 _WORD = '(?=\S)[^/\[\]]+'
 IPA_REGEX = fr'(?:^|(?<=\W))(/{_WORD}/|\[{_WORD}\])(?:$|(?=\W))'
+_IPA_PATTERN = re.compile(IPA_REGEX)
+
+def _MayContainIPA(string):
+  """Whether string contains a delimiter that can start IPA"""
+
+  # Much cheaper than running the lookbehind-heavy IPA regex.
+  return '/' in string or '[' in string
 
-# TODO: Add tests.
 def FindAndRemoveIPA(string):
-  return re.sub(IPA_REGEX, '', string)
+  if not _MayContainIPA(string):
+    return string
+  return _IPA_PATTERN.sub('', string)
+
+def FindIPASpans(string):
+  """Iterates over the (start, end) spans of IPA transcriptions
+
+  string[start:end] is a transcription, including its delimiters.
+  """
+
+  if not _MayContainIPA(string):
+    return iter(())
+  return (match.span() for match in _IPA_PATTERN.finditer(string))
+
+_NOT_LATIN1_PATTERN = re.compile('[^\x00-\xff]')
+
+def _IsLatin1(string):
+  """Whether all characters of string are in Latin-1"""
+
+  # isascii() is O(1); the regex stops at the first other character.
+  return string.isascii() or _NOT_LATIN1_PATTERN.search(string) is None
+
+@_PerTable
+def _Latin1(table):
+  """Returns the 256-entry table of the scripts of Latin-1 characters
+
+  Returns (indices, entries): indices maps each Latin-1 byte to the
+  index of its script in entries, a tuple of (index, script, mask).
+  Returns None if one of the characters is used by several scripts, as
+  resolving it needs the other characters of the string.
+  """
+
+  values = [table.get(n) for n in range(256)]
+  if any(isinstance(v, frozenset) for v in values):
+    return None
+  distinct = list(dict.fromkeys(values))
+  indices = bytes(distinct.index(v) for v in values)
+  entries = tuple((i, v, 0 if v is None else SCRIPT_BITS[v])
+                  for (i, v) in enumerate(distinct))
+  return (indices, entries)
+
+def _Latin1Entries(string, table):
+  """Returns the _Latin1() entries of the scripts in string, or None
+
+  Returns None if string is not Latin-1, may contain IPA, or the table
+  has no _Latin1() table.
+  """
+
+  if _MayContainIPA(string) or not _IsLatin1(string):
+    return None
+  latin1 = _Latin1(table)
+  if latin1 is None:
+    return None
+  (indices, entries) = latin1
+  # Translating to script indices leaves only a few distinct bytes to
+  # search for, with memchr().
+  translated = string.encode('latin-1').translate(indices)
+  return [entry for entry in entries if entry[0] in translated]
+
+# Parts of the input are copied at most this many characters at a time.
+_SLICE_SIZE = 1 << 16
+
+def _UpdateFromSlice(collection, string, start, end):
+  """Calls collection.update() with the characters of string[start:end]"""
+
+  if start == 0 and end == len(string):
+    collection.update(string)
+    return
+  for i in range(start, end, _SLICE_SIZE):
+    collection.update(string[i:min(i + _SLICE_SIZE, end)])
+
+def _UpdateOutsideIPA(collection, string, spans=None):
+  """Calls collection.update() with the characters outside IPA
+
+  Input:
+    spans: The FindIPASpans() of string, if already known.
+
+  Returns the number of IPA transcriptions.
+  """
+
+  if spans is None:
+    spans = FindIPASpans(string)
+  ipa_count = 0
+  pos = 0
+  for (start, end) in spans:
+    _UpdateFromSlice(collection, string, pos, start)
+    pos = end
+    ipa_count += 1
+  _UpdateFromSlice(collection, string, pos, len(string))
+  return ipa_count
+
+_CACHE = None
+
+def ConfigureCache(max_entries, max_bytes=None):
+  """Configures caching of DetectScripts() results
+
+  The cache is disabled by default. While it is enabled, DetectScripts()
+  returns frozensets so that cached results cannot be modified.
+
+  Input:
+    max_entries: Maximum number of cached strings, 0 disables the cache.
+    max_bytes: Maximum total size of the cached strings, or None for no
+      limit.
+  """
+
+  global _CACHE
+  _CACHE = LRUCache(max_entries, max_bytes) if max_entries else None
+
+def CacheStats():
+  """Returns the hits, misses and evictions of the cache, or None"""
+
+  cache = _CACHE
+  return None if cache is None else cache.stats()
+
+def DetectScripts(string, table=None):
+  """Detects all scripts used in the string
+
+  Returns a set, or a frozenset when the cache is enabled (see
+  ConfigureCache()).
+
+  Input:
+    table: ScriptTable to use instead of the configured one, e.g. a
+      table of TenantTables. Results with a table are not cached.
+  """
+
+  if table is not None:
+    return _DetectScripts(string, table)
+  cache = _CACHE
+  if cache is not None:
+    return cache.get(string, _DetectScriptsFrozen)
+  return _DetectScripts(string)
+
+def _DetectScriptsFrozen(string):
+  return frozenset(_DetectScripts(string))
+
+def _DetectScripts(string, table=None):
+  if table is None:
+    table = _Table()
+  sinks = _COUNTERS
+  if sinks is not None:
+    return _DetectScriptsInstrumented(string, sinks, table)
+  # Most inputs are ASCII without IPA: skip the IPA pass and the table.
+  entries = _Latin1Entries(string, table)
+  if entries is not None:
+    return {script for (_, script, _) in entries if script is not None}
+  return _DetectScriptsOfChars(string, table)
+
+def _DetectScriptsOfChars(string, table=None):
+  chars = set()
+  ipa_count = _UpdateOutsideIPA(chars, string)
+  scripts = _ScriptsOfChars(chars, table)
+  if ipa_count:
+    scripts.add(Script.IPA)
+  return scripts
+
+# Tuple of the Counters that calls record their work in, None while no
+# instrumentation is active. Rebuilt under _COUNTERS_LOCK from the
+# process-wide Counters and those of the active Instrumented() blocks.
+_COUNTERS = None
+_GLOBAL_COUNTERS = None
+_BLOCK_COUNTERS = []
+_COUNTERS_LOCK = threading.Lock()
+
+def _UpdateCounters():
+  global _COUNTERS
+  sinks = list(_BLOCK_COUNTERS)
+  if _GLOBAL_COUNTERS is not None:
+    sinks.append(_GLOBAL_COUNTERS)
+  _COUNTERS = tuple(sinks) if sinks else None
+
+def ConfigureInstrumentation(enabled):
+  """Enables or disables instrumentation of DetectScripts()
+
+  While enabled, calls record their work in a process-wide Counters, see
+  InstrumentationStats(). Disabled by default, which costs one global
+  lookup per call. Independent of Instrumented() blocks.
+  """
+
+  global _GLOBAL_COUNTERS
+  with _COUNTERS_LOCK:
+    _GLOBAL_COUNTERS = Counters() if enabled else None
+    _UpdateCounters()
+
+def InstrumentationStats():
+  """Returns the counters recorded since instrumentation was enabled
+
+  Returns a dict, see Counters.as_dict(), or None while disabled.
+  """
+
+  counters = _GLOBAL_COUNTERS
+  return None if counters is None else counters.as_dict()
+
+@contextlib.contextmanager
+def Instrumented():
+  """Instruments DetectScripts() within a with block
+
+  Yields the Counters recording calls made by any thread within the
+  block, including DetectScriptSet(), DetectScriptsStream() and
+  DetectScriptsAsync(). Blocks may overlap, e.g. in several threads or
+  tasks: each records the calls made while it is active. Calls answered
+  by the cache of ConfigureCache() are not recorded.
+
+  Example:
+    with Instrumented() as counters:
+      DetectScripts(post)
+    counters.as_dict() -> {'calls': 1, 'chars': ..., 'phase_seconds':
+        {'latin1': ..., 'ipa': ..., 'chars': ..., 'lookup': ...}, ...}
+  """
+
+  counters = Counters()
+  with _COUNTERS_LOCK:
+    _BLOCK_COUNTERS.append(counters)
+    _UpdateCounters()
+  try:
+    yield counters
+  finally:
+    with _COUNTERS_LOCK:
+      # Removes this block's Counters, not the last one added.
+      del _BLOCK_COUNTERS[next(i for (i, c) in enumerate(_BLOCK_COUNTERS)
+                               if c is counters)]
+      _UpdateCounters()
+
+def _Record(sinks, table, length, chars, ipa_count, phases, latin1=False):
+  """Records one call in each Counters of sinks
+
+  Table misses are counted here, outside of the timed phases.
+  """
+
+  (stage1, blocks) = (table.stage1, table.blocks)
+  misses = sum(not blocks[stage1[n >> BLOCK_SHIFT]][n & BLOCK_MASK]
+               for n in map(ord, chars))
+  for counters in sinks:
+    counters.add(length, len(chars), ipa_count, misses, phases,
+                 latin1=latin1)
+
+def _DetectScriptsInstrumented(string, sinks, table):
+  """_DetectScripts() recording its work in each Counters of sinks
+
+  Phases are the Latin-1 fast path or its check, finding IPA, collecting
+  the distinct characters outside IPA, and looking up their scripts.
+  """
+
+  clock = time.perf_counter
+  t_start = clock()
+  entries = _Latin1Entries(string, table)
+  if entries is not None:
+    scripts = {script for (_, script, _) in entries if script is not None}
+    phases = {'latin1': clock() - t_start}
+    chars = set(string)
+    ipa_count = 0
+  else:
+    t_latin1 = clock()
+    spans = list(FindIPASpans(string))
+    t_ipa = clock()
+    chars = set()
+    ipa_count = _UpdateOutsideIPA(chars, string, spans)
+    t_chars = clock()
+    scripts = _ScriptsOfChars(chars, table)
+    if ipa_count:
+      scripts.add(Script.IPA)
+    phases = {'latin1': t_latin1 - t_start, 'ipa': t_ipa - t_latin1,
+              'chars': t_chars - t_ipa, 'lookup': clock() - t_chars}
+  _Record(sinks, table, len(string), chars, ipa_count, phases,
+          latin1=entries is not None)
+  return scripts
+
+def DetectScriptSet(string, table=None):
+  """Detects all scripts used in the string as a ScriptSet
+
+  Same scripts as DetectScripts(), but combined as bitmasks without
+  hashing Script members, which makes aggregating many results cheap.
+  Not cached.
+
+  Input:
+    table: ScriptTable to use instead of the configured one.
+
+  Example:
+    total = ScriptSet()
+    for post in posts:
+      total |= DetectScriptSet(post)
+  """
+
+  if table is None:
+    table = _Table()
+  sinks = _COUNTERS
+  if sinks is not None:
+    return ScriptSet(_DetectScriptsInstrumented(string, sinks, table))
+  entries = _Latin1Entries(string, table)
+  if entries is not None:
+    return ScriptSet.from_mask(
+        functools.reduce(operator.or_, (mask for (_, _, mask) in entries), 0))
+  chars = set()
+  ipa_count = _UpdateOutsideIPA(chars, string)
+  mask = _MaskOfIndices(table, _IndicesOfChars(table, chars))
+  if ipa_count:
+    mask |= SCRIPT_BITS[Script.IPA]
+  return ScriptSet.from_mask(mask)
+
+# IPA_REGEX, one delimiter at a time, for DetectScriptsStream().
+_DELIMITER_PATTERN = re.compile(r'[/\[\]]')
+_NON_WORD_PATTERN = re.compile(r'\W')
+_NON_SPACE_PATTERN = re.compile(r'\S')
+_CLOSERS = {'/': '/', '[': ']'}
+
+def _RFindDelimiter(text, start, end):
+  """Returns the position of the last delimiter in text[start:end], or -1"""
+
+  return max(text.rfind('/', start, end), text.rfind('[', start, end),
+             text.rfind(']', start, end))
+
+class _IPAStream:
+  """Collects the characters outside IPA of text fed in pieces
+
+  A transcription of IPA_REGEX spans an opening delimiter and the next
+  delimiter, so the state is the pending opening delimiter, the distinct
+  characters since it, and whether a closing delimiter waits for the
+  character after it. Memory does not grow with the length of the text.
+  """
+
+  def __init__(self):
+    self.chars = set()
+    self.ipa_count = 0
+    self.length = 0  # Number of characters fed.
+    self._prev = None  # Last character fed, None at the start.
+    self._opener = None  # Pending opening delimiter.
+    self._pending = set()  # Distinct characters since _opener.
+    self._first = None  # First character after _opener.
+    self._closer = False  # Whether the last character closes _opener.
+    self._before_closer = None
+
+  def feed(self, text):
+    self.length += len(text)
+    if self._opener is None and not _MayContainIPA(text) and ']' not in text:
+      if text:
+        self.chars.update(text)
+        self._prev = text[-1]
+      return
+    # Step through delimiters until no transcription is pending.
+    pos = 0
+    if self._opener is not None or self._closer:
+      for match in _DELIMITER_PATTERN.finditer(text):
+        self._Feed(text, pos, match.start())
+        pos = match.start()
+        if self._opener is None and not self._closer:
+          break
+        self._Delimiter(match.group())
+        pos = match.end()
+    if self._opener is None and not self._closer:
+      end = _RFindDelimiter(text, pos, len(text))
+      last_opener = _RFindDelimiter(text, pos, end)
+      if last_opener >= 0:
+        pos = self._FeedRegex(text, pos, last_opener, end)
+    self._Feed(text, pos, len(text))
+
+  def _FeedRegex(self, text, pos, last_opener, end):
+    """Feeds text[pos:] with _IPA_PATTERN up to the last delimiters
+
+    The transcription opened by the delimiter at last_opener closes at the
+    delimiter at end at the earliest, so its outcome depends on the text
+    after end. Returns the position up to which text was fed.
+    """
+
+    if pos == 0 and self._prev is not None:
+      # Keep the previous character for the lookbehind of IPA_REGEX.
+      (window, offset) = (self._prev + text[:end], 1)
+    else:
+      (window, offset) = (text, 0)
+    stop = last_opener
+    for match in _IPA_PATTERN.finditer(window, pos + offset, end + offset):
+      (start, stop_match) = (match.start() - offset, match.end() - offset)
+      _UpdateFromSlice(self.chars, text, pos, start)
+      self.ipa_count += 1
+      pos = stop_match
+      stop = max(stop, stop_match)
+    _UpdateFromSlice(self.chars, text, pos, stop)
+    if stop:
+      self._prev = text[stop - 1]
+    return stop
+
+  def _Feed(self, text, start, end):
+    """Feeds text[start:end] one delimiter at a time"""
+
+    pos = start
+    for match in _DELIMITER_PATTERN.finditer(text, start, end):
+      if pos < match.start():
+        self._Text(text[pos:match.start()])
+      self._Delimiter(match.group())
+      pos = match.end()
+    if pos < end:
+      self._Text(text[pos:end])
+
+  def close(self):
+    """Ends the text"""
+
+    if self._closer:
+      self._EndTranscription(True)  # Matched by $.
+    self._DropOpener()
+
+  def _EndTranscription(self, matched):
+    """Decides the pending transcription on the character after it"""
+
+    self._closer = False
+    closer = _CLOSERS[self._opener]
+    if matched:
+      self.ipa_count += 1
+      self._opener = None
+      self._pending = set()
+      self._prev = closer
+      return
+    # The closing delimiter may open another transcription.
+    self._DropOpener()
+    self._prev = self._before_closer
+    self._Delimiter(closer)
 
-def DetectScripts(string):
-  """Detects all scripts used in the string"""
+  def _DropOpener(self):
+    if self._opener is not None:
+      self.chars |= self._pending
+      self._opener = None
+      self._pending = set()
 
-  no_ipa_string = FindAndRemoveIPA(string)
-  scripts = {DetectScript(char) for char in no_ipa_string}
-  scripts.discard(None)
-  if len(no_ipa_string) < len(string):
+  def _Text(self, text):
+    if self._closer:
+      self._EndTranscription(_NON_WORD_PATTERN.match(text) is not None)
+    if self._opener is None:
+      self.chars.update(text)
+    else:
+      if self._first is None:
+        self._first = text[0]
+      self._pending.update(text)
+    self._prev = text[-1]
+
+  def _Delimiter(self, char):
+    if self._closer:
+      self._EndTranscription(True)  # Delimiters are non-word characters.
+    if self._opener is not None:
+      if (char == _CLOSERS[self._opener] and self._first is not None and
+          _NON_SPACE_PATTERN.match(self._first)):
+        self._closer = True
+        self._before_closer = self._prev
+        self._prev = char
+        return
+      self._DropOpener()
+    if char in _CLOSERS and (self._prev is None or
+                             _NON_WORD_PATTERN.match(self._prev)):
+      self._opener = char
+      self._pending = {char}
+      self._first = None
+    else:
+      self.chars.add(char)
+    self._prev = char
+
+def DetectScriptsStream(fileobj, chunk_size=1 << 16):
+  """Detects all scripts used in the text read from a file object
+
+  Returns the same set as DetectScripts() on the whole text, reading it
+  chunk_size characters at a time, so memory does not grow with the
+  length of the text.
+
+  Input:
+    fileobj: File object open in text mode, or any object whose read()
+      returns strings, e.g. io.StringIO.
+    chunk_size: Number of characters to read at a time.
+  """
+
+  start = time.perf_counter()
+  stream = _IPAStream()
+  while True:
+    chunk = fileobj.read(chunk_size)
+    if not chunk:
+      break
+    stream.feed(chunk)
+  return _ScriptsOfStream(stream, start)
+
+def _ScriptsOfStream(stream, start):
+  """Returns the scripts of the text fed to stream since start
+
+  Instrumented calls record finding IPA and collecting the distinct
+  characters, interleaved in stream.feed(), as the 'chars' phase.
+  """
+
+  stream.close()
+  sinks = _COUNTERS
+  t_chars = time.perf_counter()
+  table = _Table()
+  scripts = _ScriptsOfChars(stream.chars, table)
+  if stream.ipa_count:
     scripts.add(Script.IPA)
+  if sinks is not None:
+    phases = {'chars': t_chars - start,
+              'lookup': time.perf_counter() - t_chars}
+    _Record(sinks, table, stream.length, stream.chars, stream.ipa_count,
+            phases)
   return scripts
+
+def CountScripts(string):
+  """Counts the characters of each script used in the string
+
+  Returns a collections.Counter mapping each Script to its number of
+  characters. Script.IPA counts IPA transcriptions rather than their
+  characters. Characters without a script are not counted, and
+  characters used by several scripts count toward one of the scripts
+  DetectScripts() resolves them to.
+  """
+
+  char_counts = collections.Counter()
+  ipa_count = _UpdateOutsideIPA(char_counts, string)
+  table = _Table()
+  index_counts = collections.Counter()
+  for char, count in char_counts.items():
+    index_counts[table.blocks[table.stage1[ord(char) >> BLOCK_SHIFT]][
+        ord(char) & BLOCK_MASK]] += count
+  (masks, extensions) = _Masks(table)
+  counts = collections.Counter()
+  for i, count in index_counts.items():
+    script = table.values[i]
+    if script is not None and i not in extensions:
+      counts[script] += count
+  if not extensions.isdisjoint(index_counts):
+    (_, resolved) = _ResolvedMasks(table, index_counts)
+    for i in extensions.intersection(index_counts):
+      scripts = MaskToScripts(resolved[masks[i]])
+      if scripts:
+        # Count toward the most used of the scripts it resolves to.
+        script = max(sorted(scripts, key=SCRIPT_BITS.__getitem__),
+                     key=counts.__getitem__)
+        counts[script] += index_counts[i]
+  if ipa_count:
+    counts[Script.IPA] = ipa_count
+  return counts
+
+def ScriptRatios(counts):
+  """Returns the share of characters of each script
+
+  Input:
+    counts: Result of CountScripts(). IPA transcriptions are left out
+      since they are not counted in characters.
+  """
+
+  total = sum(n for (s, n) in counts.items() if s is not Script.IPA)
+  return {s: n / total for (s, n) in counts.items()
+          if s is not Script.IPA}
+
+def DominantScript(counts):
+  """Returns the script with the most characters, or None
+
+  Input:
+    counts: Result of CountScripts(). IPA transcriptions are left out
+      since they are not counted in characters.
+  """
+
+  return max((s for s in counts if s is not Script.IPA),
+             key=counts.__getitem__, default=None)
+
+@_PerTable
+def _RangesByScript(table):
+  ranges = collections.defaultdict(list)
+  for (start, end, script) in table.ranges():
+    ranges[script].append((start, end))
+  return ranges
+
+def _CharClass(table, scripts):
+  """Returns the body of a regex character class matching scripts"""
+
+  ranges = _RangesByScript(table)
+  return ''.join(f'\\U{start:08X}-\\U{end:08X}'
+                 for script in scripts for (start, end) in ranges[script])
+
+def _ClassRegex(table, scripts, negate=False):
+  """Returns a regex matching one character of scripts, or not of them
+
+  Scripts without any range in table, e.g. Script.Zzzz, give an empty
+  character class, which re cannot compile: such a regex never matches,
+  or matches any character when negated.
+  """
+
+  body = _CharClass(table, scripts)
+  if not body:
+    return r'[\s\S]' if negate else '(?!)'
+  return f'[^{body}]' if negate else f'[{body}]'
+
+@_PerTable
+def _Patterns(table):
+  """Returns the dicts of the compiled _RunPattern() and _ForeignPattern()
+  regexes of table
+  """
+
+  return ({}, {})
+
+# Maximum number of _ForeignPattern() regexes kept per table, as callers
+# choose the allowed sets.
+_MAX_FOREIGN_PATTERNS = 1024
+
+def _RunPattern(table, script):
+  """Returns a compiled regex matching a run of characters of script"""
+
+  patterns = _Patterns(table)[0]
+  pattern = patterns.get(script)
+  if pattern is None:
+    # At most one per value of table.
+    pattern = patterns[script] = re.compile(
+        f'{_ClassRegex(table, [script])}+')
+  return pattern
+
+def _ForeignPattern(table, allowed):
+  """Returns a compiled regex matching a character not in allowed
+
+  Characters without a script or of several scripts are never matched.
+  """
+
+  patterns = _Patterns(table)[1]
+  pattern = patterns.get(allowed)
+  if pattern is None:
+    extensions = {v for v in table.values if isinstance(v, frozenset)}
+    pattern = re.compile(
+        _ClassRegex(table, allowed | extensions | {None}, negate=True))
+    if len(patterns) >= _MAX_FOREIGN_PATTERNS:
+      patterns.clear()
+    patterns[allowed] = pattern
+  return pattern
+
+@_PerTable
+def _ExtensionPattern(table):
+  """Returns a compiled regex matching characters of several scripts
+
+  Returns None if table has no script extensions.
+  """
+
+  extensions = [v for v in table.values if isinstance(v, frozenset)]
+  if not extensions:
+    return None
+  return re.compile(_ClassRegex(table, extensions))
+
+def _HasExtensions(table, string):
+  """Whether string has a character of several scripts"""
+
+  pattern = _ExtensionPattern(table)
+  return pattern is not None and pattern.search(string) is not None
+
+def _IterRuns(string, pos, endpos):
+  table = _Table()
+  while pos < endpos:
+    script = table.get(ord(string[pos]))
+    end = _RunPattern(table, script).match(string, pos, endpos).end()
+    yield (pos, end, script)
+    pos = end
+
+def IterScriptRuns(string):
+  """Iterates over maximal runs of characters of the same script
+
+  Yields (start, end, script) tuples such that string[start:end] is a
+  run. IPA transcriptions are yielded as single Script.IPA runs, runs
+  of characters without a script have script None, and runs of
+  characters used by several scripts have the frozenset of these
+  scripts, as returned by DetectScript(). Each run is
+  found with a single regex match, so long runs cost little Python work.
+
+  Example:
+    list(IterScriptRuns('hi мир')) ->
+        [(0, 2, Script.Latn), (2, 3, None), (3, 6, Script.Cyrl)]
+  """
+
+  pos = 0
+  for (start, end) in FindIPASpans(string):
+    yield from _IterRuns(string, pos, start)
+    yield (start, end, Script.IPA)
+    pos = end
+  yield from _IterRuns(string, pos, len(string))
+
+def _FirstDelimiter(string):
+  """Returns the index of the first possible IPA delimiter, or -1"""
+
+  slash = string.find('/')
+  bracket = string.find('[')
+  return bracket if slash < 0 else slash if bracket < 0 else min(
+      slash, bracket)
+
+def _BeforeIPA(string, match):
+  """Whether a match starts before any IPA transcription could start"""
+
+  delimiter = _FirstDelimiter(string)
+  return delimiter < 0 or match.start() < delimiter
+
+def HasScript(string, script):
+  """Whether DetectScripts(string) would contain script
+
+  Stops at the first character of script outside IPA transcriptions.
+  """
+
+  if script is Script.IPA:
+    return (_MayContainIPA(string) and
+            _IPA_PATTERN.search(string) is not None)
+  table = _Table()
+  pattern = _RunPattern(table, script)
+  match = pattern.search(string)
+  if match is not None:
+    if _BeforeIPA(string, match):
+      return True
+    pos = 0
+    for (start, end) in FindIPASpans(string):
+      if pattern.search(string, pos, start):
+        return True
+      pos = end
+    if pattern.search(string, pos):
+      return True
+  # Characters of several scripts may still resolve to script.
+  return _HasExtensions(table, string) and script in _DetectScripts(string)
+
+def FirstForeignScript(string, allowed):
+  """Returns the first script used in the string that is not allowed
+
+  Scripts are ordered by their first use in the string, an IPA
+  transcription counting as a use of Script.IPA. Returns None when
+  DetectScripts(string) would be a subset of allowed. Stops at the first
+  character or IPA transcription that decides the result.
+
+  Input:
+    allowed: Iterable of Script.
+  """
+
+  allowed = frozenset(allowed)
+  table = _Table()
+  if _HasExtensions(table, string):
+    return _FirstForeignScriptOfRuns(table, string, allowed)
+  pattern = _ForeignPattern(table, allowed)
+  match = pattern.search(string)
+  if match is None and Script.IPA in allowed:
+    # IPA transcriptions can hide foreign characters, but not add any.
+    return None
+  if match is not None and _BeforeIPA(string, match):
+    return DetectScript(match.group())
+  pos = 0
+  for (start, end) in FindIPASpans(string):
+    match = pattern.search(string, pos, start)
+    if match:
+      return DetectScript(match.group())
+    if Script.IPA not in allowed:
+      return Script.IPA
+    pos = end
+  match = pattern.search(string, pos)
+  return DetectScript(match.group()) if match else None
+
+def _FirstForeignScriptOfRuns(table, string, allowed):
+  """FirstForeignScript() for strings with characters of several scripts
+
+  Resolves these characters as DetectScripts() does, then walks the
+  script runs of the string.
+  """
+
+  chars = set()
+  _UpdateOutsideIPA(chars, string)
+  (_, resolved) = _ResolvedMasks(table, _IndicesOfChars(table, chars))
+  for (_, _, script) in IterScriptRuns(string):
+    if isinstance(script, frozenset):
+      foreign = MaskToScripts(resolved[ScriptsToMask(script)]) - allowed
+      if foreign:
+        return min(foreign, key=SCRIPT_BITS.__getitem__)
+    elif script is not None and script not in allowed:
+      return script
+  return None
+
+def OnlyScripts(string, allowed):
+  """Whether all scripts used in the string are allowed
+
+  Input:
+    allowed: Iterable of Script.
+  """
+
+  return FirstForeignScript(string, allowed) is None
+
+def _LoadTables(table):
+  """Initializes a worker process of DetectScriptsMany()
+
+  Workers started with the spawn or forkserver methods do not inherit
+  the table of ConfigureScriptTable(), so it is passed to them.
+  """
+
+  if table is None:
+    data.SCRIPT_TABLE
+  else:
+    ConfigureScriptTable(table)
+
+def _DetectScriptsChunk(strings):
+  return [DetectScripts(string) for string in strings]
+
+def _Chunks(iterator, size):
+  while chunk := list(itertools.islice(iterator, size)):
+    yield chunk
+
+def DetectScriptsMany(strings, workers=None, chunksize=256):
+  """Detects all scripts used in each string of an iterable
+
+  Yields one result per string, in input order. Strings are sent to a
+  pool of worker processes in chunks of chunksize strings, and each
+  worker loads the script tables once when it starts, using the table of
+  ConfigureScriptTable() whatever the start method of the pool.
+  Inputs that fit in fewer than one chunk per worker, or workers=1, are
+  handled in this process.
+
+  Input:
+    strings: Iterable of strings, consumed lazily.
+    workers: Number of worker processes, defaults to the number of CPUs.
+    chunksize: Number of strings sent to a worker at a time.
+  """
+
+  if workers is None:
+    workers = os.cpu_count() or 1
+  strings = iter(strings)
+  first = list(itertools.islice(strings, workers * chunksize))
+  if workers <= 1 or len(first) < workers * chunksize:
+    yield from map(DetectScripts, first)
+    yield from map(DetectScripts, strings)
+    return
+
+  # Imported here since it is slow to import and most callers never use
+  # a pool.
+  import concurrent.futures
+  pool = concurrent.futures.ProcessPoolExecutor(
+      workers, initializer=_LoadTables, initargs=(_SCRIPT_TABLE,))
+  try:
+    pending = collections.deque()
+    chunks = itertools.chain(_Chunks(iter(first), chunksize),
+                             _Chunks(strings, chunksize))
+    for chunk in chunks:
+      pending.append(pool.submit(_DetectScriptsChunk, chunk))
+      # Keep every worker busy while bounding the number of results held
+      # in memory.
+      if len(pending) > 2 * workers:
+        yield from pending.popleft().result()
+    while pending:
+      yield from pending.popleft().result()
+  finally:
+    pool.shutdown(cancel_futures=True)
+
+# Strings of at least this many characters are detected off the event
+# loop by DetectScriptsAsync().
+_ASYNC_THRESHOLD = 1 << 14
+_ASYNC_WORKERS = None
+_ASYNC_EXECUTOR = None
+_ASYNC_LOCK = threading.Lock()
+
+def ConfigureAsync(threshold, workers=None):
+  """Configures DetectScriptsAsync()
+
+  Input:
+    threshold: Minimum number of characters of a string to detect it in
+      the shared executor instead of on the event loop, 16384 by default.
+    workers: Maximum number of threads of the shared executor, or None
+      for the ThreadPoolExecutor default.
+  """
+
+  global _ASYNC_THRESHOLD, _ASYNC_WORKERS, _ASYNC_EXECUTOR
+  executor = None
+  with _ASYNC_LOCK:
+    _ASYNC_THRESHOLD = threshold
+    if workers != _ASYNC_WORKERS:
+      (executor, _ASYNC_EXECUTOR) = (_ASYNC_EXECUTOR, None)
+      _ASYNC_WORKERS = workers
+  if executor is not None:
+    # Running detections finish in the old executor.
+    executor.shutdown(wait=False)
+
+def _AsyncExecutor():
+  """Returns the shared executor of DetectScriptsAsync()"""
+
+  global _ASYNC_EXECUTOR
+  with _ASYNC_LOCK:
+    if _ASYNC_EXECUTOR is None:
+      # Imported here since it is slow to import and most callers never
+      # use an executor.
+      import concurrent.futures
+      _ASYNC_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+          _ASYNC_WORKERS, thread_name_prefix='DetectScriptsAsync')
+    return _ASYNC_EXECUTOR
+
+def _DetectScriptsInSlices(string):
+  """DetectScripts() in slices, so that other threads can run between them
+
+  A single set.update() or regex call over a long string holds the GIL,
+  and the event loop with it, until it returns.
+  """
+
+  cache = _CACHE
+  if cache is not None:
+    return cache.get(string, _DetectScriptsOfSlicesFrozen)
+  return _DetectScriptsOfSlices(string)
+
+def _DetectScriptsOfSlicesFrozen(string):
+  return frozenset(_DetectScriptsOfSlices(string))
+
+def _DetectScriptsOfSlices(string):
+  start = time.perf_counter()
+  stream = _IPAStream()
+  for i in range(0, len(string), _SLICE_SIZE):
+    stream.feed(string[i:i + _SLICE_SIZE])
+  return _ScriptsOfStream(stream, start)
+
+async def DetectScriptsAsync(string):
+  """Detects all scripts used in the string without blocking the loop
+
+  Strings shorter than the threshold of ConfigureAsync() are detected
+  inline, as handing them to a thread costs more than detecting them.
+  Longer ones run in a shared executor with a bounded number of threads.
+  """
+
+  if len(string) < _ASYNC_THRESHOLD:
+    return DetectScripts(string)
+  import asyncio
+  return await asyncio.get_running_loop().run_in_executor(
+      _AsyncExecutor(), _DetectScriptsInSlices, string)
+
+async def _AsyncIter(strings):
+  if hasattr(strings, '__aiter__'):
+    async for string in strings:
+      yield string
+  else:
+    for string in strings:
+      yield string
+
+async def DetectScriptsAsyncMany(strings, limit=16):
+  """Detects all scripts used in each string of an iterable
+
+  Yields one result per string, in input order. At most limit strings
+  are being detected at a time, and no further string is read from
+  strings until the oldest result is consumed, so a fast producer or a
+  slow consumer does not pile up work.
+
+  Input:
+    strings: Iterable or async iterable of strings, consumed lazily.
+    limit: Maximum number of strings read ahead.
+
+  Example:
+    async for scripts in DetectScriptsAsyncMany(posts):
+      ...
+  """
+
+  import asyncio
+  pending = collections.deque()
+  try:
+    async for string in _AsyncIter(strings):
+      pending.append(asyncio.ensure_future(DetectScriptsAsync(string)))
+      if len(pending) >= limit:
+        yield await pending.popleft()
+    while pending:
+      yield await pending.popleft()
+  finally:
+    for future in pending:
+      future.cancel()
+
+# Strings with IPA delimiters in every position, for the tests below.
+_TEST_STRINGS = (
+    '', '/', '[]', 'a /haɪ/ b', '/haɪ/', '[ðə]x', 'a[ðə] [x]', '/a/b/',
+    '[a]]', '[ a]', '/ð/ /ə/', 'мир /mir/ मौसम।', 'x/y/ [z', '] [ð] /',
+    '[[ð]]', 'a।b', '/।/', 'ə.[ə]/ə/,',
+)
+
+def _TestStrings(count=300, seed=1):
+  """Yields _TEST_STRINGS and random strings of delimiters and letters"""
+
+  import random
+  rng = random.Random(seed)
+  yield from _TEST_STRINGS
+  alphabet = '/[] .aðəмम।'
+  for _ in range(count):
+    yield ''.join(rng.choice(alphabet) for _ in range(rng.randrange(12)))
+
+def _test_stream():
+  import io
+  for string in _TestStrings():
+    scripts = DetectScripts(string)
+    # Chunk boundaries fall before and after every delimiter.
+    for chunk_size in range(1, len(string) + 2):
+      assert(DetectScriptsStream(io.StringIO(string), chunk_size) ==
+             scripts), (string, chunk_size)
+    stream = _IPAStream()
+    for char in string:
+      stream.feed(char)
+    stream.close()
+    assert(stream.ipa_count == len(list(FindIPASpans(string))))
+
+def _test_queries():
+  # IPA transcriptions are not characters of a script.
+  assert(ScriptRatios(collections.Counter()) == {})
+  assert(DominantScript(collections.Counter()) is None)
+  counts = CountScripts('[ðə] /ə/')
+  assert(counts == {Script.IPA: 2})
+  assert(ScriptRatios(counts) == {})
+  assert(DominantScript(counts) is None)
+  counts = CountScripts('ab м [ðəðəðə]')
+  assert(ScriptRatios(counts) == {Script.Latn: 2 / 3, Script.Cyrl: 1 / 3})
+  assert(DominantScript(counts) is Script.Latn)
+  scripts_used = {Script.Latn, Script.Cyrl, Script.Deva, Script.IPA}
+  for string in _TestStrings():
+    scripts = DetectScripts(string)
+    ipa_spans = list(FindIPASpans(string))
+    runs = list(IterScriptRuns(string))
+    kept = zip([0] + [end for (_, end) in ipa_spans],
+               [start for (start, _) in ipa_spans] + [len(string)])
+    assert(FindAndRemoveIPA(string) ==
+           ''.join(string[start:end] for (start, end) in kept))
+    assert(''.join(string[start:end] for (start, end, _) in runs) ==
+           string)
+    assert([(start, end) for (start, end, script) in runs
+            if script is Script.IPA] == ipa_spans)
+    for ((_, _, script), (_, _, next_script)) in zip(runs, runs[1:]):
+      assert(script is Script.IPA or script != next_script)
+    for (start, end, script) in runs:
+      if script is not Script.IPA:
+        assert(all(DetectScript(char) == script
+                   for char in string[start:end]))
+    counts = CountScripts(string)
+    assert(set(counts) == scripts), string
+    assert(counts[Script.IPA] == len(ipa_spans))
+    ratios = ScriptRatios(counts)
+    assert(set(ratios) == set(counts) - {Script.IPA})
+    assert(not ratios or abs(sum(ratios.values()) - 1) < 1e-9)
+    dominant = DominantScript(counts)
+    if ratios:
+      assert(ratios[dominant] == max(ratios.values()))
+    else:
+      assert(dominant is None)
+    for script in scripts_used:
+      assert(HasScript(string, script) == (script in scripts)), string
+    for allowed in ({}, {Script.Latn}, {Script.Latn, Script.IPA},
+                    scripts_used - {Script.Deva}):
+      first = FirstForeignScript(string, allowed)
+      if first is None:
+        assert(scripts <= set(allowed)), string
+      else:
+        assert(first in scripts - set(allowed)), string
+
+def _test_many():
+  import multiprocessing
+  from .ranges import Range, RangeDict
+  strings = ['abc', 'мир', 'a b', 'x [ðə]', ''] * 6
+  # Fewer strings than one chunk per worker are handled in this process.
+  assert(list(DetectScriptsMany(strings[:5], workers=2, chunksize=4)) ==
+         [DetectScripts(string) for string in strings[:5]])
+  # Workers must use the configured table, in which spaces are Common,
+  # whatever the start method.
+  previous_table = _SCRIPT_TABLE
+  start_method = multiprocessing.get_start_method()
+  ConfigureScriptTable(
+      _Table().overlay(RangeDict([(Range(0x20, 0x20), Script.Zyyy)])))
+  try:
+    expected = [DetectScripts(string) for string in strings]
+    assert(Script.Zyyy in expected[2])
+    for method in ('fork', 'spawn'):
+      if method in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method(method, force=True)
+        assert(list(DetectScriptsMany(iter(strings), workers=2,
+                                      chunksize=3)) == expected), method
+  finally:
+    multiprocessing.set_start_method(start_method, force=True)
+    ConfigureScriptTable(previous_table)
+
+def _test_async():
+  import asyncio
+  limit = 4
+  read = []
+  def counting(strings):
+    for string in strings:
+      read.append(string)
+      yield string
+  async def async_counting(strings):
+    for string in counting(strings):
+      await asyncio.sleep(0)
+      yield string
+  async def consume(source, count=None):
+    results = []
+    many = DetectScriptsAsyncMany(source, limit)
+    async for scripts in many:
+      # At most limit strings are read ahead of the consumer.
+      assert(len(read) <= len(results) + limit)
+      results.append(scripts)
+      if len(results) == count:
+        await many.aclose()
+        await asyncio.sleep(0)
+        # Detections started ahead of the consumer are cancelled.
+        assert(all(task.done() for task in asyncio.all_tasks()
+                   if getattr(task.get_coro(), '__name__', None) ==
+                   'DetectScriptsAsync'))
+        break
+    return results
+  def check(strings, count=None):
+    expected = [DetectScripts(string) for string in strings][:count]
+    for source in (counting, async_counting):
+      read.clear()
+      assert(asyncio.run(consume(source(strings), count)) == expected)
+      assert(len(read) <= len(expected) + limit)
+  check(['abc', 'мир', 'x [ðə]', 'a' * 100, ''] * 4)
+  check(['abc', 'мир', 'x [ðə]', 'a' * 100, ''] * 4, count=2)
+
+  # Replacing the executor, and strings above the threshold detected in
+  # it.
+  (threshold, workers) = (_ASYNC_THRESHOLD, _ASYNC_WORKERS)
+  executor = _AsyncExecutor()
+  try:
+    ConfigureAsync(8, workers=1)
+    assert(_ASYNC_EXECUTOR is None and _ASYNC_THRESHOLD == 8)
+    assert(asyncio.run(DetectScriptsAsync('мир [ðə] мир')) ==
+           {Script.Cyrl, Script.IPA})
+    assert(_ASYNC_EXECUTOR is not None and _ASYNC_EXECUTOR is not executor)
+    assert(_ASYNC_EXECUTOR._max_workers == 1)
+    assert(asyncio.run(DetectScriptsAsync('abc')) == {Script.Latn})
+    # Detections waiting for the single thread are cancelled by aclose().
+    check(['мир ' * 50000, 'abc ' * 50000] * 4, count=1)
+    same = _ASYNC_EXECUTOR
+    ConfigureAsync(16, workers=1)
+    assert(_ASYNC_EXECUTOR is same)
+  finally:
+    ConfigureAsync(threshold, workers)
+
+def _test_cache():
+  from .ranges import Range, RangeDict
+  assert(CacheStats() is None)
+  assert(type(DetectScripts('abc')) is set)
+  ConfigureCache(max_entries=2)
+  try:
+    assert(DetectScripts('abc') == frozenset({Script.Latn}))
+    assert(type(DetectScripts('abc')) is frozenset)
+    stats = CacheStats()
+    assert((stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1))
+    # Results with a table bypass the cache.
+    table = _Table().overlay(RangeDict([(Range(0x20, 0x20), Script.Zyyy)]))
+    assert(DetectScripts('a b', table=table) == {Script.Latn, Script.Zyyy})
+    assert(type(DetectScripts('a b', table=table)) is set)
+    assert(CacheStats()['entries'] == 1)
+    # Configuring another table clears the cache.
+    previous_table = _SCRIPT_TABLE
+    ConfigureScriptTable(table)
+    try:
+      assert(CacheStats()['entries'] == 0)
+      assert(DetectScripts('a b') == {Script.Latn, Script.Zyyy})
+    finally:
+      ConfigureScriptTable(previous_table)
+    assert(DetectScripts('a b') == {Script.Latn})
+  finally:
+    ConfigureCache(0)
+  assert(CacheStats() is None)
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  for script in Script:
+    for string in ('abc', 'a мир [ðə] 1', ''):
+      scripts = DetectScripts(string)
+      assert(HasScript(string, script) == (script in scripts))
+      first = FirstForeignScript(string, [script])
+      assert((first is None) == (scripts <= {script}))
+  _test_stream()
+  _test_queries()
+  _test_many()
+  _test_async()
+  _test_cache()
+
+  # Overlapping Instrumented() blocks each leave instrumentation as they
+  # found it.
+  import asyncio
+  import io
+  a = Instrumented()
+  b = Instrumented()
+  counters_a = a.__enter__()
+  counters_b = b.__enter__()
+  a.__exit__(None, None, None)
+  DetectScripts('abc')
+  b.__exit__(None, None, None)
+  assert(_COUNTERS is None)
+  assert(counters_a.calls == 0 and counters_b.calls == 1)
+  with Instrumented() as counters:
+    assert(DetectScriptSet('abc') == {Script.Latn})
+    assert(DetectScriptsStream(io.StringIO('a [ðə]'), 2) ==
+           {Script.Latn, Script.IPA})
+    long_string = 'a' * _ASYNC_THRESHOLD
+    assert(asyncio.run(DetectScriptsAsync(long_string)) == {Script.Latn})
+  stats = counters.as_dict()
+  assert(stats['calls'] == 3)
+  assert(stats['chars'] == 3 + 6 + _ASYNC_THRESHOLD)
+  assert(stats['ipa_matches'] == 1)
+
+  # The process-wide switch, independent of Instrumented() blocks.
+  assert(InstrumentationStats() is None)
+  ConfigureInstrumentation(True)
+  try:
+    with Instrumented() as counters:
+      DetectScripts('a [ðə]')
+    DetectScripts('abc')
+    stats = InstrumentationStats()
+    assert(stats['calls'] == 2 and stats['chars'] == 9)
+    assert(stats['latin1_calls'] == 1 and stats['ipa_matches'] == 1)
+    assert(counters.calls == 1)
+  finally:
+    ConfigureInstrumentation(False)
+  assert(InstrumentationStats() is None)
+  assert(_COUNTERS is None)
+
+  # Tables of tenants keep their derived tables while in use, and free
+  # them with the table.
+  import gc
+  from .ranges import Range, RangeDict
+  overlay = _Table().overlay(RangeDict([(Range(0xE000, 0xE0FF),
+                                         Script.Grek)]))
+  assert(DetectScripts('a\ue000', table=overlay) ==
+         {Script.Latn, Script.Grek})
+  assert(DetectScriptSet('a\ue000', table=overlay) ==
+         {Script.Latn, Script.Grek})
+  assert(DetectScripts('a\ue000') == {Script.Latn})
+  assert(HasScript('a\ue000', Script.Grek) is False)
+  # Neither the derived tables nor the regexes of a configured table keep
+  # it alive once it is replaced.
+  ref = weakref.ref(overlay)
+  previous_table = _SCRIPT_TABLE
+  ConfigureScriptTable(overlay)
+  try:
+    assert(HasScript('a\ue000', Script.Grek))
+    assert(FirstForeignScript('a\ue000', [Script.Latn]) is Script.Grek)
+    assert(list(IterScriptRuns('a\ue000')) ==
+           [(0, 1, Script.Latn), (1, 2, Script.Grek)])
+  finally:
+    ConfigureScriptTable(previous_table)
+  del overlay
+  gc.collect()
+  assert(ref() is None)
@@ -0,0 +1,83 @@
+import threading
+
+class Counters:
+  """Counters of the work done by DetectScripts()
+
+  See detect_script.Instrumented(). Safe to update from several threads.
+
+  Example:
+    counters = Counters()
+    counters.add(chars=5, distinct_chars=4, ipa_matches=0, table_misses=1,
+                 phases={'chars': 1e-6, 'lookup': 2e-6})
+    counters.as_dict() -> {'calls': 1, 'chars': 5, ...}
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.reset()
+
+  def reset(self):
+    with self._lock:
+      self.calls = 0
+      self.latin1_calls = 0
+      self.chars = 0
+      self.distinct_chars = 0
+      self.ipa_matches = 0
+      self.table_misses = 0
+      self.phase_seconds = {}
+
+  def add(self, chars, distinct_chars, ipa_matches, table_misses, phases,
+          latin1=False):
+    """Records one call
+
+    Input:
+      chars: Length of the string.
+      distinct_chars: Number of distinct characters outside IPA.
+      ipa_matches: Number of IPA transcriptions.
+      table_misses: Number of distinct characters without a script.
+      phases: Dict mapping phase names to wall time in seconds.
+      latin1: Whether the call took the Latin-1 fast path.
+    """
+
+    with self._lock:
+      self.calls += 1
+      self.latin1_calls += latin1
+      self.chars += chars
+      self.distinct_chars += distinct_chars
+      self.ipa_matches += ipa_matches
+      self.table_misses += table_misses
+      phase_seconds = self.phase_seconds
+      for (phase, seconds) in phases.items():
+        phase_seconds[phase] = phase_seconds.get(phase, 0) + seconds
+
+  def as_dict(self):
+    """Returns the counters as a dict of numbers, e.g. for a metrics
+    pipeline
+    """
+
+    with self._lock:
+      return {
+          'calls': self.calls,
+          'latin1_calls': self.latin1_calls,
+          'chars': self.chars,
+          'distinct_chars': self.distinct_chars,
+          'ipa_matches': self.ipa_matches,
+          'table_misses': self.table_misses,
+          'phase_seconds': dict(self.phase_seconds),
+      }
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  counters = Counters()
+  counters.add(5, 4, 0, 1, {'chars': 1.0, 'lookup': 2.0})
+  counters.add(10, 3, 2, 0, {'chars': 0.5}, latin1=True)
+  stats = counters.as_dict()
+  assert(stats['calls'] == 2)
+  assert(stats['latin1_calls'] == 1)
+  assert(stats['chars'] == 15)
+  assert(stats['distinct_chars'] == 7)
+  assert(stats['ipa_matches'] == 2)
+  assert(stats['table_misses'] == 1)
+  assert(stats['phase_seconds'] == {'chars': 1.5, 'lookup': 2.0})
+  counters.reset()
+  assert(counters.as_dict()['calls'] == 0)
@@ -1,4 +1,9 @@
+import array
 import bisect
+import collections.abc
+import itertools
+import math
+import operator
 
 # TODO: Use a proper unit test framework for all these tests.
 def _assert_error(thunk, expect):
@@ -29,6 +34,8 @@ class Range:
     - Range(1, 4) < Range(4, 9) -> False
   """
 
+  __slots__ = ('_start', '_end')
+
   def __init__(self, start, end):
     if end < start:
       raise ValueError(f'Invalid range Range({start}, {end}). End of '
@@ -98,11 +105,70 @@ class Range:
     assert(not (5 < Range(1, 4)))
     assert(5 > Range(1, 4))
 
+def _CompactList(numbers):
+  """Returns numbers as an array('I') if they all fit, else as a list"""
+
+  numbers = list(numbers)
+  try:
+    return array.array('I', numbers)
+  except (OverflowError, TypeError):
+    return numbers
+
+def _Insert(numbers, i, n):
+  """Inserts n in a list from _CompactList(), returns the list"""
+
+  try:
+    numbers.insert(i, n)
+  except (OverflowError, TypeError):
+    numbers = list(numbers)
+    numbers.insert(i, n)
+  return numbers
+
+class _Block:
+  """Consecutive ranges of a RangeDict with their values
+
+  starts and ends hold the bounds of ranges, as returned by
+  _CompactList().
+  """
+
+  __slots__ = ('starts', 'ends', 'ranges', 'values')
+
+  def __init__(self, ranges, values):
+    self.ranges = ranges
+    self.values = values
+    self.starts = _CompactList(r.start() for r in ranges)
+    self.ends = _CompactList(r.end() for r in ranges)
+
+  def insert(self, i, r, value):
+    self.ranges.insert(i, r)
+    self.values.insert(i, value)
+    self.starts = _Insert(self.starts, i, r.start())
+    self.ends = _Insert(self.ends, i, r.end())
+
+  def __delitem__(self, i):
+    del self.ranges[i]
+    del self.values[i]
+    del self.starts[i]
+    del self.ends[i]
+
+  def split(self):
+    """Moves the second half of the block to a new block and returns it"""
+
+    half = len(self.ranges) // 2
+    block = _Block(self.ranges[half:], self.values[half:])
+    del self.ranges[half:]
+    del self.values[half:]
+    del self.starts[half:]
+    del self.ends[half:]
+    return block
+
 class RangeDict:
   """Dict mapping ranges of numbers to any value
 
-  Optimized for fast lookup by storing the ranges in a sorted list,
-  insertions and deletions are slower.
+  The ranges are sorted and split into blocks of at most
+  2 * RangeDict.LOAD ranges, each storing the starts and ends of its
+  ranges in arrays. A lookup is two bisections, and an insertion or
+  deletion only shifts the items of one block.
 
   Example:
   range_dict = RangeDict([(Range(1, 3), 'foo'), (Range(5, 9), 'bar')])
@@ -115,54 +181,169 @@ class RangeDict:
 
   """
 
+  LOAD = 512
+
   def __init__(self, rangemap):
     """
     Input:
       rangemap: List of 2-tuples, each tuple maps a Range to a value.
     """
 
-    self._data = sorted(rangemap, key=lambda tup: tup[0])
-    self._validate()
+    self._init_sorted(sorted(rangemap, key=lambda tup: tup[0].start()))
+
+  @classmethod
+  def from_sorted(cls, rangemap):
+    """Creates a RangeDict from (Range, value) pairs sorted by range
+
+    Skips sorting, but still raises ValueError if the ranges are out of
+    order or overlap.
+    """
 
-  def _validate(self):
-    prev = None
-    for r in self._data:
-      if not (prev is None or prev < r):
-        assert(not (prev > r))  # This would imply a sorting error.
+    range_dict = cls.__new__(cls)
+    range_dict._init_sorted(list(rangemap))
+    return range_dict
+
+  def _init_sorted(self, data):
+    ranges = [r for (r, _) in data]
+    self._validate(ranges)
+    self._blocks = [
+        _Block(ranges[i:i + self.LOAD], [v for (_, v) in data[i:i + self.LOAD]])
+        for i in range(0, len(data), self.LOAD)]
+    # First start of each block, bisected to find the block of a number.
+    self._block_starts = [block.starts[0] for block in self._blocks]
+    self._len = len(data)
+
+  @staticmethod
+  def _validate(ranges):
+    for (prev, r) in zip(ranges, ranges[1:]):
+      if not prev.end() < r.start():
+        if r.start() < prev.start():
+          raise ValueError(f'RangeDict: Ranges must be sorted, but {r} '
+                           f'comes after {prev}.')
         raise ValueError(f'RangeDict: Ranges cannot overlap, but {r} '
                          f'overlaps with {prev}.')
-      prev = r
 
   def __str__(self):
     contents = ', '.join(f'{str(r)}: {str(v)}'
-                         for (r, v) in self._data)
+                         for (r, v) in self.items())
     return f'{{{contents}}}'
 
   def __repr__(self):
-    return f'RangeDict({repr(self._data)})'
+    return f'{type(self).__name__}({repr(list(self.items()))})'
 
   def __format__(self, fmt):
     contents = ', '.join(f'({format(r, fmt)}, {repr(v)})'
-                         for (r, v) in self._data)
-    return f'RangeDict([{contents}])'
+                         for (r, v) in self.items())
+    return f'{type(self).__name__}([{contents}])'
 
   def fmt(self, fmt_range=repr, fmt_value=repr):
     contents = ', '.join(f'({r.fmt(fmt_range)}, {fmt_value(v)})'
-                         for (r, v) in self._data)
-    return f'RangeDict([{contents}])'
+                         for (r, v) in self.items())
+    return f'{type(self).__name__}([{contents}])'
 
   def pprint(self, indent=0, indent_offset=4, file=None):
     print(' ' * indent + '{', file=file)
     indent2 = indent + indent_offset
-    for (r, v) in self._data:
+    for (r, v) in self.items():
       print(' ' * indent2, r, ': ', v, ',', sep='', file=file)
     print(' ' * indent + '}', file=file)
 
   def __eq__(self, other):
-    return self._data == other._data
+    return list(self.items()) == list(other.items())
+
+  def __len__(self):
+    return self._len
+
+  def items(self):
+    """Iterates over (Range, value) pairs in ascending order"""
+
+    for block in self._blocks:
+      yield from zip(block.ranges, block.values)
+
+  def coalesced(self):
+    """Returns a copy with touching ranges of equal values merged
+
+    Ranges are merged when one ends right before the next one starts,
+    which assumes integer ranges, e.g. Range(1, 3) and Range(4, 6).
+
+    Example:
+      RangeDict([(Range(1, 3), 'A'), (Range(4, 6), 'A'),
+                 (Range(7, 9), 'B')]).coalesced() ->
+          RangeDict([(Range(1, 6), 'A'), (Range(7, 9), 'B')])
+    """
+
+    data = []
+    for (r, v) in self.items():
+      if data and data[-1][1] == v and data[-1][0].end() + 1 == r.start():
+        prev = data[-1][0]
+        data[-1] = (type(prev)(prev.start(), r.end()), v)
+      else:
+        data.append((r, v))
+    return type(self).from_sorted(data)
+
+  def merged(self, overrides):
+    """Returns a copy where the ranges of overrides take precedence
+
+    Ranges of self that overlap ranges of overrides are cut around them,
+    which assumes integer ranges.
+
+    Example:
+      RangeDict([(Range(1, 9), 'A')]).merged(
+          RangeDict([(Range(4, 5), 'B')])) ->
+          RangeDict([(Range(1, 3), 'A'), (Range(4, 5), 'B'),
+                     (Range(6, 9), 'A')])
+    """
+
+    over = list(overrides.items())
+    data = []
+    j = 0
+    for (r, v) in self.items():
+      while j < len(over) and over[j][0].end() < r.start():
+        j += 1
+      start = r.start()
+      k = j
+      while k < len(over) and over[k][0].start() <= r.end():
+        o = over[k][0]
+        if start < o.start():
+          data.append((type(r)(start, o.start() - 1), v))
+        start = max(start, o.end() + 1)
+        k += 1
+      if start == r.start():
+        data.append((r, v))
+      elif start <= r.end():
+        data.append((type(r)(start, r.end()), v))
+    data.extend(over)
+    return type(self)(data)
+
+  def frozen(self):
+    """Returns an immutable FrozenRangeDict with the same items"""
+
+    return FrozenRangeDict.from_sorted(self.items())
+
+  def normalize(self):
+    """Merges touching ranges of equal values in place
+
+    Returns the number of ranges removed. See coalesced().
+    """
+
+    coalesced = self.coalesced()
+    removed = self._len - coalesced._len
+    self._blocks = coalesced._blocks
+    self._block_starts = coalesced._block_starts
+    self._len = coalesced._len
+    return removed
 
   def _find(self, n):
-    return bisect.bisect_left(self._data, n, key=lambda tup: tup[0])
+    """Returns the block and index of the last range starting at or before n
+
+    Returns (None, -1) if there is none.
+    """
+
+    b = bisect.bisect_right(self._block_starts, n) - 1
+    if b < 0:
+      return (None, -1)
+    block = self._blocks[b]
+    return (block, bisect.bisect_right(block.starts, n) - 1)
 
   def __contains__(self, n):
     """
@@ -170,8 +351,8 @@ class RangeDict:
       n: number
     """
 
-    i = self._find(n)
-    return i < len(self._data) and n in self._data[i][0]
+    (block, i) = self._find(n)
+    return i >= 0 and n <= block.ends[i]
 
   def __getitem__(self, n):
     """
@@ -179,37 +360,103 @@ class RangeDict:
       n: number
     """
 
-    i = self._find(n)
-    if i < len(self._data) and n in self._data[i][0]:
-      return self._data[i][1]
+    (block, i) = self._find(n)
+    if i >= 0 and n <= block.ends[i]:
+      return block.values[i]
     raise KeyError
 
+  def getmany(self, numbers, default=None):
+    """Looks up many numbers in one pass
+
+    Returns a list holding the value of each number, or default for
+    numbers that are not in any range. The whole lookup runs as C-level
+    map() pipelines, without a Python-level loop or KeyError per number.
+
+    Input:
+      numbers: Iterable of numbers, e.g. a list, array or memoryview.
+    """
+
+    # Index 0 of these is a sentinel for numbers before the first range,
+    # so that bisect_right() indexes them directly.
+    ends = [-math.inf]
+    values = [default]
+    starts = []
+    for block in self._blocks:
+      ends.extend(block.ends)
+      values.extend(block.values)
+      starts.extend(block.starts)
+    if not isinstance(numbers, collections.abc.Sequence):
+      numbers = list(numbers)
+    indices = list(map(bisect.bisect_right, itertools.repeat(starts),
+                       numbers))
+    found = map(operator.le, numbers, map(ends.__getitem__, indices))
+    # Numbers past the end of their range map to index 0, the default.
+    return list(map(values.__getitem__, map(operator.mul, indices, found)))
+
+  def _find_range(self, r):
+    """Returns the block index and index where r is or would be inserted"""
+
+    b = max(bisect.bisect_right(self._block_starts, r.start()) - 1, 0)
+    return (b, bisect.bisect_left(self._blocks[b].starts, r.start()))
+
   def __setitem__(self, r, value):
     """
     Input:
       r: Range
     """
 
-
-    i = self._find(r.start())
-    if i >= len(self._data) or r < self._data[i][0]:
-      self._data.insert(i, (r, value))
-    elif r == self._data[i][0]:
-      self._data[i] = (r, value)
+    if not self._blocks:
+      self._blocks.append(_Block([r], [value]))
+      self._block_starts.append(r.start())
+      self._len = 1
+      return
+    (b, i) = self._find_range(r)
+    block = self._blocks[b]
+    if i < len(block.ranges) and r == block.ranges[i]:
+      block.ranges[i] = r
+      block.values[i] = value
+      return
+    if i > 0:
+      prev_end = block.ends[i - 1]
+    elif b > 0:
+      prev_end = self._blocks[b - 1].ends[-1]
+    else:
+      prev_end = None
+    if i < len(block.ranges):
+      next_start = block.starts[i]
+    elif b + 1 < len(self._blocks):
+      next_start = self._block_starts[b + 1]
     else:
+      next_start = None
+    if ((prev_end is not None and not prev_end < r.start()) or
+        (next_start is not None and not r.end() < next_start)):
       raise KeyError
-
-  def __delitem__(self, r, value):
+    block.insert(i, r, value)
+    self._block_starts[b] = block.starts[0]
+    self._len += 1
+    if len(block.ranges) > 2 * self.LOAD:
+      self._blocks.insert(b + 1, block.split())
+      self._block_starts.insert(b + 1, self._blocks[b + 1].starts[0])
+
+  def __delitem__(self, r):
     """
     Input:
       r: Range
     """
 
-    i = self._find(r.start())
-    if i < len(self._data) and r == self._data[i][0]:
-      del self._data[i]
-    else:
+    if not self._blocks:
+      raise KeyError
+    (b, i) = self._find_range(r)
+    block = self._blocks[b]
+    if not (i < len(block.ranges) and r == block.ranges[i]):
       raise KeyError
+    del block[i]
+    self._len -= 1
+    if block.ranges:
+      self._block_starts[b] = block.starts[0]
+    else:
+      del self._blocks[b]
+      del self._block_starts[b]
 
   # TODO: Use a proper unit test framework for all these tests.
   @classmethod
@@ -231,6 +478,90 @@ class RangeDict:
     assert(10 not in d)
     assert(d[2] == 'A')
     assert(d[6] == 'B')
+    _assert_error(lambda: d[4], KeyError)
+    d[Range(10, 12)] = 'C'
+    d[Range(4, 4)] = 'D'
+    d[Range(5, 9)] = 'E'
+    assert(d == RangeDict([(Range(1, 3), 'A'), (Range(4, 4), 'D'),
+                           (Range(5, 9), 'E'), (Range(10, 12), 'C')]))
+    assert(d[4] == 'D')
+    assert(d[11] == 'C')
+    def set_overlapping():
+      d[Range(12, 13)] = 'F'
+    _assert_error(set_overlapping, KeyError)
+    assert(d.getmany([11, 0, 4, 4, 13, 2]) ==
+           ['C', None, 'D', 'D', None, 'A'])
+    assert(d.getmany(memoryview(array.array('I', [12, 1])), default='Z') ==
+           ['C', 'A'])
+    assert(d.getmany([]) == [])
+    del d[Range(4, 4)]
+    assert(4 not in d)
+    assert(len(d) == 3)
+    _assert_error(lambda: d.__delitem__(Range(4, 4)), KeyError)
+    assert(RangeDict.from_sorted([(Range(1, 3), 'A'), (Range(5, 9), 'B')]) ==
+           RangeDict([(Range(5, 9), 'B'), (Range(1, 3), 'A')]))
+    _assert_error(
+        lambda: RangeDict.from_sorted([(Range(5, 9), 'B'), (Range(1, 3), 'A')]),
+        ValueError)
+    d = RangeDict([(Range(1, 3), 'A'), (Range(4, 6), 'A'), (Range(8, 9), 'A'),
+                   (Range(10, 12), 'B'), (Range(13, 13), 'B')])
+    assert(d.coalesced() == RangeDict([(Range(1, 6), 'A'), (Range(8, 9), 'A'),
+                                       (Range(10, 13), 'B')]))
+    assert(len(d) == 5)
+    assert(d.normalize() == 2)
+    assert(d == RangeDict([(Range(1, 6), 'A'), (Range(8, 9), 'A'),
+                           (Range(10, 13), 'B')]))
+    assert(d.normalize() == 0)
+    assert(d.merged(RangeDict([(Range(0, 1), 'C'), (Range(5, 8), 'C'),
+                               (Range(13, 20), 'C')])) ==
+           RangeDict([(Range(0, 1), 'C'), (Range(2, 4), 'A'),
+                      (Range(5, 8), 'C'), (Range(9, 9), 'A'),
+                      (Range(10, 12), 'B'), (Range(13, 20), 'C')]))
+    assert(d.merged(RangeDict([])) == d)
+    big = RangeDict([(Range(-1, 0), 'A'), (Range(2**40, 2**41), 'B')])
+    assert(-1 in big)
+    assert(big[2**40 + 1] == 'B')
+    assert(1 not in big)
+
+class FrozenRangeDict(RangeDict):
+  """RangeDict that cannot be modified after it is created
+
+  __setitem__, __delitem__ and normalize() raise TypeError, so that
+  threads can share it without locks. Copies such as coalesced() and
+  merged() are frozen too; RangeDict(frozen.items()) makes a mutable
+  copy.
+  """
+
+  def _immutable(self, *args):
+    raise TypeError(f'{type(self).__name__} is immutable.')
+
+  __setitem__ = _immutable
+  __delitem__ = _immutable
+  normalize = _immutable
+
+  def frozen(self):
+    return self
+
+  def __hash__(self):
+    return hash(tuple((r.start(), r.end(), v) for (r, v) in self.items()))
+
+  # TODO: Use a proper unit test framework for all these tests.
+  @classmethod
+  def _test(cls):
+    d = RangeDict([(Range(1, 3), 'A'), (Range(5, 9), 'B')])
+    frozen = d.frozen()
+    assert(frozen == d)
+    assert(frozen[2] == 'A')
+    assert(frozen.frozen() is frozen)
+    def set_item():
+      frozen[Range(10, 12)] = 'C'
+    _assert_error(set_item, TypeError)
+    _assert_error(lambda: frozen.__delitem__(Range(1, 3)), TypeError)
+    _assert_error(frozen.normalize, TypeError)
+    assert(isinstance(frozen.merged(d), FrozenRangeDict))
+    assert(hash(frozen) == hash(FrozenRangeDict(list(d.items()))))
+    d[Range(10, 12)] = 'C'
+    assert(len(frozen) == 2)
 
 # TODO: Use a proper unit test framework for all these tests.
 def _test_bisect():
@@ -252,3 +583,4 @@ def _test():
   Range._test()
   _test_bisect()
   RangeDict._test()
+  FrozenRangeDict._test()
@@ -0,0 +1,177 @@
+import functools
+
+from .data import Script
+
+# One bit per Script member, in declaration order.
+SCRIPT_BITS = {script: 1 << i for (i, script) in enumerate(Script)}
+_SCRIPTS = tuple(Script)
+
+def ScriptsToMask(scripts):
+  """Returns the bitmask of an iterable of Script"""
+
+  mask = 0
+  for script in scripts:
+    mask |= SCRIPT_BITS[script]
+  return mask
+
+def MaskToScripts(mask):
+  """Returns the set of Script of a bitmask"""
+
+  return set(_IterMask(mask))
+
+def _IterMask(mask):
+  """Yields the Script of each bit of mask, in declaration order"""
+
+  while mask:
+    low = mask & -mask
+    yield _SCRIPTS[low.bit_length() - 1]
+    mask ^= low
+
+# Few distinct combinations of scripts occur in practice.
+@functools.lru_cache(maxsize=4096)
+def _MaskHash(mask):
+  """Returns the hash of the frozenset of Script of a bitmask"""
+
+  return hash(frozenset(_IterMask(mask)))
+
+class ScriptSet:
+  """Immutable set of Script stored as an int bitmask
+
+  Union, intersection, containment and len() are integer operations, so
+  aggregating many results avoids hashing Script members. Bits follow the
+  declaration order of Script, so pickled sets stay valid only as long as
+  members are appended to Script.
+
+  Example:
+    latin = ScriptSet([Script.Latn])
+    both = latin | ScriptSet([Script.Cyrl])
+    Script.Cyrl in both -> True
+    len(both) -> 2
+    both.to_set() -> {Script.Latn, Script.Cyrl}
+  """
+
+  __slots__ = ('_mask',)
+
+  def __init__(self, scripts=()):
+    """
+    Input:
+      scripts: Iterable of Script, e.g. a set returned by DetectScripts().
+    """
+
+    self._mask = ScriptsToMask(scripts)
+
+  @classmethod
+  def from_mask(cls, mask):
+    """Returns the ScriptSet of a bitmask, see mask()"""
+
+    if mask < 0 or mask >> len(_SCRIPTS):
+      raise ValueError(f'ScriptSet: {mask:#x} is not a mask of Script.')
+    script_set = cls.__new__(cls)
+    script_set._mask = mask
+    return script_set
+
+  def mask(self):
+    return self._mask
+
+  def to_set(self):
+    return MaskToScripts(self._mask)
+
+  def __contains__(self, script):
+    return bool(self._mask & SCRIPT_BITS.get(script, 0))
+
+  def __iter__(self):
+    return _IterMask(self._mask)
+
+  def __len__(self):
+    return bin(self._mask).count('1')
+
+  def __bool__(self):
+    return self._mask != 0
+
+  def __or__(self, other):
+    if not isinstance(other, ScriptSet):
+      return NotImplemented
+    return ScriptSet.from_mask(self._mask | other._mask)
+
+  def __and__(self, other):
+    if not isinstance(other, ScriptSet):
+      return NotImplemented
+    return ScriptSet.from_mask(self._mask & other._mask)
+
+  def __sub__(self, other):
+    if not isinstance(other, ScriptSet):
+      return NotImplemented
+    return ScriptSet.from_mask(self._mask & ~other._mask)
+
+  def __xor__(self, other):
+    if not isinstance(other, ScriptSet):
+      return NotImplemented
+    return ScriptSet.from_mask(self._mask ^ other._mask)
+
+  def __le__(self, other):
+    if not isinstance(other, ScriptSet):
+      return NotImplemented
+    return self._mask & ~other._mask == 0
+
+  def __ge__(self, other):
+    if not isinstance(other, ScriptSet):
+      return NotImplemented
+    return other._mask & ~self._mask == 0
+
+  def __eq__(self, other):
+    if isinstance(other, ScriptSet):
+      return self._mask == other._mask
+    if isinstance(other, (set, frozenset)):
+      return self.to_set() == other
+    return NotImplemented
+
+  # Equal to sets of the same scripts, so it must hash like them.
+  def __hash__(self):
+    return _MaskHash(self._mask)
+
+  # Pickles as the mask alone instead of the Script members.
+  def __getstate__(self):
+    return self._mask
+
+  def __setstate__(self, mask):
+    self._mask = mask
+
+  def __repr__(self):
+    return f'ScriptSet({{{", ".join(repr(s) for s in self)}}})'
+
+  def __str__(self):
+    return f'{{{", ".join(s.name for s in self)}}}'
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  import pickle
+  assert(ScriptsToMask([]) == 0)
+  assert(MaskToScripts(0) == set())
+  scripts = {Script.Zzzz, Script.Latn, Script.Adlm}
+  assert(MaskToScripts(ScriptsToMask(scripts)) == scripts)
+  assert(ScriptsToMask([Script.Zzzz]) == 1)
+
+  latin = ScriptSet([Script.Latn])
+  both = latin | ScriptSet([Script.Cyrl])
+  assert(Script.Cyrl in both)
+  assert(Script.Arab not in both)
+  assert(len(both) == 2)
+  assert(len(ScriptSet()) == 0 and not ScriptSet())
+  assert(both & latin == latin)
+  assert(both - latin == ScriptSet([Script.Cyrl]))
+  assert(both ^ latin == {Script.Cyrl})
+  assert(latin <= both and both >= latin and not both <= latin)
+  assert(both.to_set() == {Script.Latn, Script.Cyrl})
+  assert(set(both) == both.to_set())
+  assert(list(ScriptSet(scripts)) == sorted(scripts, key=SCRIPT_BITS.get))
+  assert(ScriptSet.from_mask(both.mask()) == both)
+  assert(hash(ScriptSet.from_mask(both.mask())) == hash(both))
+  assert(hash(both) == hash(frozenset(both.to_set())))
+  assert(len({both, frozenset(both.to_set())}) == 1)
+  assert(pickle.loads(pickle.dumps(both)) == both)
+  assert(len(pickle.dumps(both)) < len(pickle.dumps(both.to_set())))
+  try:
+    ScriptSet.from_mask(1 << len(_SCRIPTS))
+    assert(False)
+  except ValueError:
+    pass
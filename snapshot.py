@@ -0,0 +1,161 @@
+"""Binary snapshot of the compiled script table
+
+Building SCRIPT_TABLE from DATA costs a few milliseconds of CPU in every
+process. Run this module once at build time to store the compiled table
+next to data.py:
+
+  python -m unicode_scripts.snapshot
+
+Processes then map the file into memory and share its pages instead of
+compiling the table. The snapshot records a checksum of data.py and is
+ignored when it does not match, e.g. after DATA was edited.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from .data import Script
+from .table import BLOCK_SIZE, ScriptTable
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'script_table.bin')
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'data.py')
+
+_MAGIC = b'USCRIPTS'
+# Increment when the layout of the file or of ScriptTable changes.
+_VERSION = 2
+# magic, version, byte order, checksum of data.py, length of the value
+# names, number of stage1 entries, number of blocks.
+_HEADER = struct.Struct('<8sIc3x32sIII')
+_BYTEORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+def _DataChecksum(data_path=DATA_PATH):
+  with open(data_path, 'rb') as f:
+    return hashlib.sha256(f.read()).digest()
+
+def _EncodeValue(value):
+  """Encodes None, a Script or a frozenset of Script as a string"""
+
+  if value is None:
+    return ''
+  if isinstance(value, frozenset):
+    return '+'.join(sorted(script.name for script in value))
+  return value.name
+
+def _DecodeValue(name):
+  if not name:
+    return None
+  if '+' in name:
+    return frozenset(Script[n] for n in name.split('+'))
+  return Script[name]
+
+def _Align(offset, alignment=8):
+  return -(-offset // alignment) * alignment
+
+def Write(table, path=SNAPSHOT_PATH, data_path=DATA_PATH):
+  """Writes table to path
+
+  Input:
+    table: ScriptTable whose values are None, Script members or
+      frozensets of them.
+  """
+
+  names = '\n'.join(_EncodeValue(v) for v in table.values).encode('ascii')
+  header = _HEADER.pack(_MAGIC, _VERSION, _BYTEORDER,
+                        _DataChecksum(data_path), len(names),
+                        len(table.stage1), len(table.blocks))
+  stage1_offset = _Align(_HEADER.size + len(names))
+  tmp_path = f'{path}.{os.getpid()}.tmp'
+  with open(tmp_path, 'wb') as f:
+    f.write(header)
+    f.write(names)
+    f.write(bytes(stage1_offset - f.tell()))
+    f.write(table.stage1.tobytes())
+    for block in table.blocks:
+      f.write(block)
+  # Readers never see a partially written file.
+  os.replace(tmp_path, path)
+
+def Load(path=SNAPSHOT_PATH, data_path=DATA_PATH):
+  """Maps the snapshot at path into memory as a ScriptTable
+
+  Returns None if the file is missing, unreadable or corrupt, has another
+  format version or byte order, or was written for another version of
+  data.py, including when data.py itself is missing, so that callers
+  fall back to compiling the table.
+  """
+
+  try:
+    return _Load(path, data_path)
+  except (OSError, ValueError, KeyError, struct.error):
+    # UnicodeDecodeError is a ValueError.
+    return None
+
+def _Load(path, data_path):
+  try:
+    f = open(path, 'rb')
+  except FileNotFoundError:
+    return None
+  with f:
+    if os.fstat(f.fileno()).st_size < _HEADER.size:
+      return None
+    # The mapping stays valid after the file is closed.
+    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  view = memoryview(buf)
+  (magic, version, byteorder, checksum, names_len, stage1_len,
+   block_count) = _HEADER.unpack_from(view)
+  if (magic != _MAGIC or version != _VERSION or byteorder != _BYTEORDER or
+      checksum != _DataChecksum(data_path)):
+    return None
+  names = bytes(view[_HEADER.size:_HEADER.size + names_len])
+  values = tuple(_DecodeValue(name)
+                 for name in names.decode('ascii').split('\n'))
+  stage1_offset = _Align(_HEADER.size + names_len)
+  blocks_offset = stage1_offset + 2 * stage1_len
+  if len(view) != blocks_offset + BLOCK_SIZE * block_count:
+    return None
+  stage1 = view[stage1_offset:blocks_offset].cast('H')
+  blocks = tuple(view[offset:offset + BLOCK_SIZE]
+                 for offset in range(blocks_offset, len(view), BLOCK_SIZE))
+  # Corrupt indices would only fail at lookup time.
+  if (max(stage1, default=0) >= block_count or
+      max(view[blocks_offset:], default=0) >= len(values)):
+    return None
+  return ScriptTable(stage1, blocks, values)
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  import tempfile
+  from .data import RANGE_DICT, SCRIPT_TABLE
+  with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, 'script_table.bin')
+    assert(Load(path) is None)
+    Write(SCRIPT_TABLE, path)
+    table = Load(path)
+    table._test_matches(RANGE_DICT)
+    other_data_path = os.path.join(tmp, 'data.py')
+    with open(other_data_path, 'w') as f:
+      f.write('# Edited\n')
+    assert(Load(path, data_path=other_data_path) is None)
+    assert(Load(path, data_path=os.path.join(tmp, 'missing.py')) is None)
+    with open(path, 'r+b') as f:
+      f.seek(_HEADER.size)
+      f.write(b'\xff')
+    assert(Load(path) is None)
+    Write(SCRIPT_TABLE, path)
+    with open(path, 'r+b') as f:
+      f.seek(-1, os.SEEK_END)
+      f.write(b'\xff')
+    assert(Load(path) is None)
+
+def main():
+  from .data import RANGE_DICT
+  Write(ScriptTable.from_range_dict(RANGE_DICT))
+  print(f'Wrote {SNAPSHOT_PATH}')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,248 @@
+import array
+import re
+
+BLOCK_SHIFT = 8
+BLOCK_SIZE = 1 << BLOCK_SHIFT
+BLOCK_MASK = BLOCK_SIZE - 1
+MAX_CODE_POINT = 0x10FFFF
+
+def _ReadOnly(numbers, typecode):
+  """Returns numbers as a read-only sequence of typecode items
+
+  Read-only memoryviews, e.g. of bytes or of a read-only mmap, are kept
+  as they are; anything else is copied, so that the caller cannot modify
+  the result through the original object.
+  """
+
+  if isinstance(numbers, bytes) and typecode == 'B':
+    return numbers
+  if isinstance(numbers, memoryview) and numbers.readonly:
+    view = numbers
+  else:
+    view = memoryview(array.array(typecode, numbers).tobytes())
+  return view if view.format == typecode else view.cast(typecode)
+
+class ScriptTable:
+  """Two-stage lookup table mapping code points to values
+
+  The code point space is split into blocks of BLOCK_SIZE code points.
+  Identical blocks are stored only once, so the whole table takes a few
+  tens of kilobytes. A lookup is two index operations:
+
+    values[blocks[stage1[n >> BLOCK_SHIFT]][n & BLOCK_MASK]]
+
+  Index 0 of values is always None and marks unassigned code points.
+
+  Tables are immutable: stage1 and blocks are read-only buffers, values
+  is a tuple and attributes cannot be set, so any number of threads can
+  read a table without locks.
+
+  Example:
+    table = ScriptTable.from_range_dict(
+        RangeDict([(Range(0x41, 0x5A), 'foo')]))
+    table.get(0x41) -> 'foo'
+    table.get(0x40) -> None
+    table[0x40] -> KeyError
+  """
+
+  __slots__ = ('stage1', 'blocks', 'values', '__weakref__')
+
+  def __init__(self, stage1, blocks, values):
+    """
+    Input:
+      stage1: Sequence mapping each block of code points to an index in
+        blocks.
+      blocks: Sequence of BLOCK_SIZE long byte sequences, each mapping a
+        code point in the block to an index in values.
+      values: Sequence of at most 256 values, values[0] must be None.
+    """
+
+    if values[0] is not None:
+      raise ValueError('ScriptTable: values[0] must be None.')
+    object.__setattr__(self, 'stage1', _ReadOnly(stage1, 'H'))
+    object.__setattr__(self, 'blocks',
+                       tuple(_ReadOnly(block, 'B') for block in blocks))
+    object.__setattr__(self, 'values', tuple(values))
+
+  def __setattr__(self, name, value):
+    raise AttributeError(f'ScriptTable: Cannot set {name}, tables are '
+                         f'immutable.')
+
+  def __delattr__(self, name):
+    raise AttributeError(f'ScriptTable: Cannot delete {name}, tables are '
+                         f'immutable.')
+
+  @classmethod
+  def from_range_dict(cls, range_dict):
+    """Compiles a RangeDict whose ranges are code points"""
+
+    values = [None]
+    index = {}
+    flat = bytearray(MAX_CODE_POINT + 1)
+    for (r, v) in range_dict.items():
+      i = index.get(v)
+      if i is None:
+        i = index[v] = len(values)
+        values.append(v)
+        if i > 0xFF:
+          raise ValueError('ScriptTable: Too many distinct values.')
+      flat[r.start():r.end() + 1] = bytes((i,)) * (r.end() - r.start() + 1)
+    stage1 = array.array('H')
+    blocks = []
+    unique = {}
+    for start in range(0, len(flat), BLOCK_SIZE):
+      block = bytes(flat[start:start + BLOCK_SIZE])
+      b = unique.get(block)
+      if b is None:
+        b = unique[block] = len(blocks)
+        blocks.append(block)
+      stage1.append(b)
+    return cls(stage1, tuple(blocks), tuple(values))
+
+  def overlay(self, overrides):
+    """Returns a table where the ranges of overrides take precedence
+
+    Only the blocks that overrides touch are compiled; the new table
+    shares all other blocks and values with self, so that a small
+    overlay costs the stage1 array and a few blocks.
+
+    Input:
+      overrides: RangeDict whose ranges are code points. A value of None
+        removes the code points from the table.
+
+    Example:
+      table.overlay(RangeDict([(Range(0xE000, 0xF8FF), 'private')]))
+    """
+
+    values = list(self.values)
+    index = {v: i for (i, v) in enumerate(values)}
+    touched = {}
+    for (r, v) in overrides.items():
+      i = index.get(v)
+      if i is None:
+        i = index[v] = len(values)
+        values.append(v)
+        if i > 0xFF:
+          raise ValueError('ScriptTable: Too many distinct values.')
+      start = max(r.start(), 0)
+      end = min(r.end(), MAX_CODE_POINT)
+      for b in range(start >> BLOCK_SHIFT, (end >> BLOCK_SHIFT) + 1):
+        block = touched.get(b)
+        if block is None:
+          block = touched[b] = bytearray(self.blocks[self.stage1[b]])
+        lo = max(start - (b << BLOCK_SHIFT), 0)
+        hi = min(end - (b << BLOCK_SHIFT), BLOCK_MASK)
+        block[lo:hi + 1] = bytes((i,)) * (hi - lo + 1)
+    stage1 = array.array('H', self.stage1)
+    blocks = list(self.blocks)
+    unique = {bytes(block): b for (b, block) in enumerate(blocks)}
+    for (n, block) in touched.items():
+      block = bytes(block)
+      b = unique.get(block)
+      if b is None:
+        b = unique[block] = len(blocks)
+        blocks.append(block)
+      stage1[n] = b
+    return ScriptTable(stage1, blocks, values)
+
+  # Buffers such as memoryviews of a snapshot cannot be pickled, so
+  # tables pickle as copies, e.g. to be sent to worker processes.
+  def __reduce__(self):
+    return (ScriptTable, (self.stage1.tolist(),
+                          tuple(bytes(block) for block in self.blocks),
+                          self.values))
+
+  def __contains__(self, n):
+    return self.get(n) is not None
+
+  def __getitem__(self, n):
+    v = self.get(n)
+    if v is None:
+      raise KeyError
+    return v
+
+  def get(self, n, default=None):
+    if not 0 <= n <= MAX_CODE_POINT:
+      return default
+    v = self.values[self.blocks[self.stage1[n >> BLOCK_SHIFT]][n & BLOCK_MASK]]
+    return default if v is None else v
+
+  def ranges(self):
+    """Iterates over maximal (start, end, value) runs of code points
+
+    end is inclusive. Runs of unassigned code points have value None.
+    """
+
+    block_runs = [[(m.start(), m.end() - 1, m.group()[0])
+                   for m in re.finditer(rb'(.)\1*', block, re.S)]
+                  for block in self.blocks]
+    run = None
+    for (i, b) in enumerate(self.stage1):
+      offset = i << BLOCK_SHIFT
+      for (lo, hi, v) in block_runs[b]:
+        if run is not None and run[2] == v and run[1] + 1 == offset + lo:
+          run[1] = offset + hi
+        else:
+          if run is not None:
+            yield (run[0], run[1], self.values[run[2]])
+          run = [offset + lo, offset + hi, v]
+    yield (run[0], run[1], self.values[run[2]])
+
+  def nbytes(self):
+    """Approximate memory used by the lookup arrays"""
+
+    return (self.stage1.itemsize * len(self.stage1) +
+            BLOCK_SIZE * len(self.blocks))
+
+  # TODO: Use a proper unit test framework for all these tests.
+  def _test_matches(self, range_dict):
+    for n in range(MAX_CODE_POINT + 1):
+      try:
+        expect = range_dict[n]
+      except KeyError:
+        expect = None
+      assert(self.get(n) == expect)
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  from .ranges import Range, RangeDict
+  d = RangeDict([(Range(1, 3), 'A'), (Range(5, 9), 'B'),
+                 (Range(0x10FFFE, 0x10FFFF), 'A')])
+  table = ScriptTable.from_range_dict(d)
+  table._test_matches(d)
+  assert(table.get(-1) is None)
+  assert(table.get(MAX_CODE_POINT + 1, 'X') == 'X')
+  assert(table[2] == 'A')
+  assert(4 not in table)
+  assert(len(table.values) == 3)
+  assert(table.stage1.readonly)
+  import pickle
+  pickle.loads(pickle.dumps(table))._test_matches(d)
+  try:
+    table.values = (None,)
+    assert(False)
+  except AttributeError:
+    pass
+  stage1 = array.array('H', table.stage1)
+  copy = ScriptTable(stage1, [bytearray(b) for b in table.blocks],
+                     list(table.values))
+  stage1[0] = 1
+  copy._test_matches(d)
+  overrides = RangeDict([(Range(2, 2), None), (Range(4, 4), 'A'),
+                         (Range(0x300, 0x20000), 'C')])
+  overlay = table.overlay(overrides)
+  overlay._test_matches(RangeDict(
+      [(r, v) for (r, v) in d.merged(overrides).items() if v is not None]))
+  assert(overlay.get(2) is None)
+  assert(overlay[4] == 'A')
+  assert(overlay[0x300] == 'C' and overlay[0x20000] == 'C')
+  assert(overlay.get(0x20001) is None)
+  assert(overlay[0x10FFFF] == 'A')
+  assert(overlay.blocks[overlay.stage1[0x10FFFF >> BLOCK_SHIFT]] is
+         table.blocks[table.stage1[0x10FFFF >> BLOCK_SHIFT]])
+  assert(table.get(4) is None)
+  assert(list(table.ranges()) == [
+      (0, 0, None), (1, 3, 'A'), (4, 4, None), (5, 9, 'B'),
+      (10, 0x10FFFD, None), (0x10FFFE, 0x10FFFF, 'A')])
+  from .data import RANGE_DICT, SCRIPT_TABLE
+  SCRIPT_TABLE._test_matches(RANGE_DICT)
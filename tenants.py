@@ -0,0 +1,109 @@
+import collections
+import threading
+
+from . import data
+from .ranges import RangeDict
+
+class TenantTables:
+  """Script tables of several tenants, each an overlay of a base table
+
+  A tenant registers a RangeDict of overrides, e.g. private use
+  characters of its own fonts, instead of a whole table. Its table is
+  compiled with ScriptTable.overlay() on first use, so it shares all
+  blocks that the overrides do not touch with the base table. At most
+  max_tables compiled tables are kept, least recently used first out.
+  Safe to use from several threads.
+
+  Example:
+    tenants = TenantTables()
+    tenants.register('acme', RangeDict([(Range(0xE000, 0xE0FF),
+                                         Script.Latn)]))
+    DetectScripts(text, table=tenants.table('acme'))
+  """
+
+  def __init__(self, base=None, max_tables=1024):
+    """
+    Input:
+      base: ScriptTable of tenants without overrides, or None for
+        data.SCRIPT_TABLE.
+      max_tables: Maximum number of compiled tables, must be positive.
+    """
+
+    if max_tables <= 0:
+      raise ValueError(f'TenantTables: max_tables must be positive, but is '
+                       f'{max_tables}.')
+    self._base = base
+    self._max_tables = max_tables
+    self._overrides = {}
+    self._tables = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def base(self):
+    base = self._base
+    return data.SCRIPT_TABLE if base is None else base
+
+  def register(self, tenant, overrides):
+    """Sets the overrides of tenant, replacing any previous ones
+
+    Input:
+      overrides: RangeDict of code points to Script, frozenset of Script
+        or None to remove code points. It is copied, so later changes
+        do not affect the tenant.
+    """
+
+    overrides = overrides.frozen()
+    with self._lock:
+      self._overrides[tenant] = overrides
+      self._tables.pop(tenant, None)
+
+  def unregister(self, tenant):
+    with self._lock:
+      self._overrides.pop(tenant, None)
+      self._tables.pop(tenant, None)
+
+  def table(self, tenant):
+    """Returns the ScriptTable of tenant
+
+    Tenants without overrides get the base table.
+    """
+
+    with self._lock:
+      table = self._tables.get(tenant)
+      if table is not None:
+        self._tables.move_to_end(tenant)
+        return table
+      overrides = self._overrides.get(tenant)
+    if overrides is None:
+      return self.base()
+    # Compiled outside of the lock, so concurrent misses on the same
+    # tenant may compile its table more than once.
+    table = self.base().overlay(overrides)
+    with self._lock:
+      # Skip tables of tenants that re-registered in the meantime.
+      if self._overrides.get(tenant) is overrides:
+        self._tables[tenant] = table
+        while len(self._tables) > self._max_tables:
+          self._tables.popitem(last=False)
+    return table
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  from .data import Script
+  from .ranges import Range
+  tenants = TenantTables(max_tables=1)
+  base = tenants.base()
+  assert(tenants.table('none') is base)
+  tenants.register('a', RangeDict([(Range(0xE000, 0xE0FF), Script.Latn)]))
+  tenants.register('b', RangeDict([(Range(ord('a'), ord('a')), None)]))
+  a = tenants.table('a')
+  assert(a.get(0xE000) == Script.Latn and base.get(0xE000) is None)
+  assert(a.get(ord('a')) == Script.Latn)
+  assert(tenants.table('a') is a)
+  b = tenants.table('b')
+  assert(b.get(ord('a')) is None and b.get(ord('b')) == Script.Latn)
+  # max_tables=1 evicted the table of 'a'.
+  assert(tenants.table('a') is not a)
+  tenants.register('a', RangeDict([(Range(0xE000, 0xE0FF), Script.Grek)]))
+  assert(tenants.table('a').get(0xE000) == Script.Grek)
+  tenants.unregister('a')
+  assert(tenants.table('a') is base)
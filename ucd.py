@@ -0,0 +1,279 @@
+"""Generates a script table module from the Unicode Character Database
+
+DATA in data.py is maintained by hand and leaves out many characters.
+This tool reads a local copy of the UCD file Scripts.txt, which assigns a
+script to every assigned code point, and optionally ScriptExtensions.txt,
+which lists the characters used by several scripts, and writes a module
+with the same DATA, EXTENSIONS, RANGE_DICT and SCRIPT_TABLE globals as
+data.py:
+
+  python -m unicode_scripts.ucd Scripts.txt \
+      --extensions ScriptExtensions.txt -o unicode_scripts/ucd_data.py
+
+Use its table for detection with:
+
+  from unicode_scripts import detect_script, ucd_data
+  detect_script.ConfigureScriptTable(ucd_data.SCRIPT_TABLE)
+"""
+
+import argparse
+import os
+import re
+import warnings
+
+from .data import Script
+from .ranges import FrozenRangeDict, Range, RangeDict
+from .table import MAX_CODE_POINT
+
+# Scripts.txt names that do not match a Script value.
+_ALIASES = {
+    'Canadian_Aboriginal': Script.Cans,
+    'Cypriot': Script.Cprt,
+    'Hiragana': Script.Hrkt,
+    'Katakana': Script.Hrkt,
+    'Katakana_Or_Hiragana': Script.Hrkt,
+    'Meetei_Mayek': Script.Mtei,
+}
+
+# Script has no Zinh. Inherited marks take the script of the base
+# character, so they are left without a script and never add one of
+# their own.
+_INHERITED = 'Inherited'
+
+def _Normalize(name):
+  return re.sub('[^a-z0-9]', '', name.lower())
+
+_BY_NAME = {_Normalize(s.value): s for s in Script}
+
+# ScriptExtensions.txt script codes.
+_CODES = {s.name: s for s in Script}
+_CODES.update({'Hira': Script.Hrkt, 'Kana': Script.Hrkt})
+
+def ScriptFromName(name):
+  """Returns the Script for a Scripts.txt script name, or None"""
+
+  return _ALIASES.get(name) or _BY_NAME.get(_Normalize(name))
+
+def ParseLines(lines):
+  """Parses lines of a UCD file mapping code point ranges to values
+
+  Yields (start, end, value) tuples, with end inclusive. Comments and
+  blank lines are skipped.
+
+  Example:
+    '0041..005A    ; Latin # L&  [26] LATIN CAPITAL LETTER A..'
+        -> (0x41, 0x5A, 'Latin')
+  """
+
+  for line in lines:
+    line = line.split('#', 1)[0].strip()
+    if not line:
+      continue
+    (code_points, value) = (field.strip() for field in line.split(';'))
+    (start, _, end) = code_points.partition('..')
+    yield (int(start, 16), int(end or start, 16), value)
+
+def ParseScripts(lines, fill_unknown=False):
+  """Parses Scripts.txt into a coalesced RangeDict of Script
+
+  Scripts missing from Script map to Script.Zzzz and are reported with a
+  UserWarning. Inherited code points are left out, even with fill_unknown.
+
+  Input:
+    lines: Iterable of the lines of Scripts.txt.
+    fill_unknown: Whether to map unassigned code points to Script.Zzzz,
+      so that the table has no gaps.
+  """
+
+  unknown = set()
+  rangemap = []
+  inherited = []
+  for (start, end, name) in ParseLines(lines):
+    if name == _INHERITED:
+      inherited.append((Range(start, end), None))
+      continue
+    script = ScriptFromName(name)
+    if script is None:
+      unknown.add(name)
+      script = Script.Zzzz
+    rangemap.append((Range(start, end), script))
+  if unknown:
+    warnings.warn(f'Mapped scripts missing from Script to Zzzz: '
+                  f'{", ".join(sorted(unknown))}', stacklevel=2)
+  range_dict = RangeDict(rangemap)
+  if fill_unknown:
+    gaps = []
+    start = 0
+    for (r, _) in RangeDict(rangemap + inherited).items():
+      if start < r.start():
+        gaps.append((Range(start, r.start() - 1), Script.Zzzz))
+      start = r.end() + 1
+    if start <= MAX_CODE_POINT:
+      gaps.append((Range(start, MAX_CODE_POINT), Script.Zzzz))
+    range_dict = RangeDict(list(range_dict.items()) + gaps)
+  return range_dict.coalesced()
+
+def ParseScriptExtensions(lines):
+  """Parses ScriptExtensions.txt into a RangeDict of frozenset of Script
+
+  Codes missing from Script are left out, and characters left with a
+  single script are left out too, as Scripts.txt already covers them.
+
+  Example:
+    '0964..0965    ; Beng Deva Dogr # Po   [2] DEVANAGARI DANDA..'
+        -> (Range(0x0964, 0x0965), frozenset({Beng, Deva, Dogr}))
+  """
+
+  rangemap = []
+  for (start, end, codes) in ParseLines(lines):
+    scripts = frozenset(_CODES[code] for code in codes.split()
+                        if code in _CODES)
+    if len(scripts) > 1:
+      rangemap.append((Range(start, end), scripts))
+  return RangeDict(rangemap).coalesced()
+
+def _GenerateDict(name, range_dict, format_key, sort_key):
+  """Returns the lines defining name as a dict of value -> URange list"""
+
+  by_value = {}
+  for (r, value) in range_dict.items():
+    by_value.setdefault(value, []).append(r)
+  out = [f'{name} = {{']
+  for value in sorted(by_value, key=sort_key):
+    ranges = by_value[value]
+    out.append(f'  {format_key(value)}: [')
+    out.extend(f'    URange(0x{r.start():04X}, 0x{r.end():04X}),'
+               for r in ranges)
+    out.append('  ],')
+  out.append('}')
+  return out
+
+def Generate(range_dict, source='Scripts.txt', extensions=None):
+  """Returns the source of a module defining DATA, EXTENSIONS, RANGE_DICT
+  and SCRIPT_TABLE for range_dict
+
+  Input:
+    range_dict: RangeDict of Script, as returned by ParseScripts().
+    source: Name of the files range_dict was parsed from.
+    extensions: RangeDict of frozenset of Script, as returned by
+      ParseScriptExtensions(), or None.
+  """
+
+  # In Script order, as in data.py.
+  order = {script: i for (i, script) in enumerate(Script)}
+  out = [
+      f'# Generated by python -m {__package__}.ucd from {source}.',
+      '# Do not edit.',
+      '',
+      'from .data import Script, URange',
+      'from .ranges import FrozenRangeDict, RangeDict',
+      'from .table import ScriptTable',
+      '',
+  ]
+  out.extend(_GenerateDict('DATA', range_dict,
+                           lambda script: f'Script.{script.name}',
+                           order.get))
+  out.append('')
+  out.extend(_GenerateDict(
+      'EXTENSIONS', extensions or RangeDict([]),
+      lambda scripts: 'frozenset({' + ', '.join(
+          f'Script.{name}' for name in sorted(s.name for s in scripts)) + '})',
+      lambda scripts: sorted(s.name for s in scripts)))
+  out.extend([
+      '',
+      '# Frozen, as any thread may read it.',
+      'RANGE_DICT = FrozenRangeDict(',
+      '    (r, s) for s in DATA for r in DATA[s]).merged(',
+      '        RangeDict((r, s) for s in EXTENSIONS for r in EXTENSIONS[s])',
+      ').coalesced()',
+      '',
+      'SCRIPT_TABLE = ScriptTable.from_range_dict(RANGE_DICT)',
+      '',
+  ])
+  return '\n'.join(out)
+
+# TODO: Use a proper unit test framework for all these tests.
+def _test():
+  lines = [
+      '# Scripts-15.0.0.txt',
+      '0000..0040    ; Common # Cc  [65] <control-0000>..COMMERCIAL AT',
+      '0041..005A    ; Latin # L&  [26] LATIN CAPITAL LETTER A..Z',
+      '005B..0060    ; Common # Po   [6] LEFT SQUARE BRACKET..GRAVE ACCENT',
+      '0061..007A    ; Latin # L&  [26] LATIN SMALL LETTER A..Z',
+      '0300..036F    ; Inherited # Mn [112] COMBINING GRAVE ACCENT..',
+      '3041..3096    ; Hiragana # Lo  [86] HIRAGANA LETTER SMALL A..',
+      '11F00         ; Kawi # Mn       KAWI SIGN CANDRABINDU',
+      '',
+  ]
+  with warnings.catch_warnings(record=True) as caught:
+    warnings.simplefilter('always')
+    range_dict = ParseScripts(lines)
+  assert([str(w.message) for w in caught] ==
+         ['Mapped scripts missing from Script to Zzzz: Kawi'])
+  assert(list(range_dict.items()) == [
+      (Range(0x0000, 0x0040), Script.Zyyy),
+      (Range(0x0041, 0x005A), Script.Latn),
+      (Range(0x005B, 0x0060), Script.Zyyy),
+      (Range(0x0061, 0x007A), Script.Latn),
+      (Range(0x3041, 0x3096), Script.Hrkt),
+      (Range(0x11F00, 0x11F00), Script.Zzzz),
+  ])
+  assert(ScriptFromName('Old_Italic') is Script.Ital)
+  assert(ScriptFromName('Nko') is Script.Nkoo)
+  with warnings.catch_warnings():
+    warnings.simplefilter('ignore')
+    filled = ParseScripts(lines, fill_unknown=True)
+  assert(filled[0x7B] is Script.Zzzz)
+  assert(0x0300 not in filled and 0x036F not in filled)
+  assert(filled[0x0370] is Script.Zzzz)
+  assert(filled[MAX_CODE_POINT] is Script.Zzzz)
+  assert(all(n in filled for n in range(0, MAX_CODE_POINT + 1, 0x1001)))
+  source = Generate(range_dict)
+  assert('  Script.Latn: [\n    URange(0x0041, 0x005A),\n' in source)
+  compile(source, 'ucd_data.py', 'exec')
+  extensions = ParseScriptExtensions([
+      '0964..0965    ; Beng Deva Xyzw # Po   [2] DEVANAGARI DANDA..',
+      '30FC          ; Hira Kana # Lm       KATAKANA-HIRAGANA PROLONGED..',
+      '3003          ; Bopo Hang Hani Hira Kana # Po  DITTO MARK',
+  ])
+  assert(list(extensions.items()) == [
+      (Range(0x0964, 0x0965), frozenset({Script.Beng, Script.Deva})),
+      (Range(0x3003, 0x3003),
+       frozenset({Script.Bopo, Script.Hang, Script.Hani, Script.Hrkt})),
+  ])
+  source = Generate(range_dict, extensions=extensions)
+  assert('  frozenset({Script.Beng, Script.Deva}): [\n'
+         '    URange(0x0964, 0x0965),\n' in source)
+  namespace = {'__name__': f'{__package__}.ucd_data',
+               '__package__': __package__}
+  exec(compile(source, 'ucd_data.py', 'exec'), namespace)
+  assert(isinstance(namespace['RANGE_DICT'], FrozenRangeDict))
+  assert(namespace['SCRIPT_TABLE'].get(0x0964) ==
+         frozenset({Script.Beng, Script.Deva}))
+  assert(namespace['SCRIPT_TABLE'].get(0x41) is Script.Latn)
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+      prog=f'python -m {__package__}.ucd',
+      description='Generates a script table module from Scripts.txt.')
+  parser.add_argument('scripts', help='Path to Scripts.txt')
+  parser.add_argument('-o', '--output', required=True,
+                      help='Path of the module to write')
+  parser.add_argument('--extensions',
+                      help='Path to ScriptExtensions.txt')
+  parser.add_argument('--fill-unknown', action='store_true',
+                      help='Map unassigned code points to Zzzz')
+  args = parser.parse_args(argv)
+  with open(args.scripts, encoding='utf-8') as f:
+    range_dict = ParseScripts(f, fill_unknown=args.fill_unknown)
+  sources = [os.path.basename(args.scripts)]
+  extensions = None
+  if args.extensions:
+    with open(args.extensions, encoding='utf-8') as f:
+      extensions = ParseScriptExtensions(f)
+    sources.append(os.path.basename(args.extensions))
+  with open(args.output, 'w', encoding='utf-8') as f:
+    f.write(Generate(range_dict, ' and '.join(sources), extensions))
+
+if __name__ == '__main__':
+  main()